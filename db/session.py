@@ -8,6 +8,7 @@ from pathlib import Path
 
 from sqlalchemy import create_engine, event
 from sqlalchemy import inspect as _sa_inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import NullPool
 
@@ -52,24 +53,47 @@ def _normalize_sqlite_url(db_url: str) -> str:
 # Default to the v1 database; can be overridden by STLMGR_DB_URL or per-script reconfiguration
 DB_URL = _normalize_sqlite_url(os.environ.get("STLMGR_DB_URL", "sqlite:///./data/stl_manager_v1.db"))
 
-# Use NullPool so SQLite file handles are released immediately (avoids Windows file locks in tests)
-engine = create_engine(DB_URL, future=True, poolclass=NullPool)
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):  # type: ignore[override]
+    try:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+    except Exception:
+        # Non-SQLite or connection without pragma support; ignore
+        pass
+
+
+def _engine_kwargs(db_url: str) -> dict:
+    """Dialect-specific create_engine options (none for SQLite)."""
+    try:
+        url = make_url(db_url) if make_url is not None else None
+    except Exception:
+        url = None
+    if url is not None and url.get_backend_name() == "postgresql" and url.get_driver_name() == "psycopg2":
+        # Batch executemany UPDATE/DELETE (matcher/backfill --apply) with psycopg2.extras.execute_batch;
+        # INSERTs already go through insertmanyvalues in "values" mode
+        return {"executemany_mode": "values_plus_batch"}
+    return {}
+
+
+def _create_engine(db_url: str) -> Engine:
+    # Use NullPool so SQLite file handles are released immediately (avoids Windows file locks in tests)
+    eng = create_engine(db_url, future=True, poolclass=NullPool, **_engine_kwargs(db_url))
+    # Ensure SQLite enforces foreign keys so CASCADE/SET NULL work as intended
+    if db_url.startswith("sqlite"):
+        event.listen(eng, "connect", _set_sqlite_pragma)
+    return eng
+
+
+engine = _create_engine(DB_URL)
 
 # Per-process guard: track which DB URLs have had their schema verified to avoid
 # repeating expensive reflection/DDL on every session open.
 _SCHEMA_VERIFIED: set[str] = set()
 
-# Ensure SQLite enforces foreign keys so CASCADE/SET NULL work as intended
-if DB_URL.startswith("sqlite"):
-    @event.listens_for(engine, "connect")
-    def _set_sqlite_pragma(dbapi_connection, connection_record):  # type: ignore[override]
-        try:
-            cursor = dbapi_connection.cursor()
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.close()
-        except Exception:
-            # Non-SQLite or connection without pragma support; ignore
-            pass
+# Engines for URLs other than the active DB_URL, handed out by get_engine()
+_ENGINES: dict[str, Engine] = {}
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, class_=Session)
 
 
@@ -162,14 +186,24 @@ def reconfigure(db_url: str) -> None:
         except Exception:
             pass
         DB_URL = _normalize_sqlite_url(db_url)
-        engine = create_engine(DB_URL, future=True, poolclass=NullPool)
-        if DB_URL.startswith("sqlite"):
-            @event.listens_for(engine, "connect")
-            def _set_sqlite_pragma_new(dbapi_connection, connection_record):  # type: ignore[override]
-                try:
-                    cursor = dbapi_connection.cursor()
-                    cursor.execute("PRAGMA foreign_keys=ON")
-                    cursor.close()
-                except Exception:
-                    pass
+        engine = _create_engine(DB_URL)
         SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, class_=Session)
+
+
+def get_engine(db_url: str | None = None) -> Engine:
+    """Return a process-wide engine for db_url (default: the active DB_URL).
+
+    Report/maintenance scripts that run raw SQL use this instead of calling create_engine on every
+    invocation, so dialect setup and compiled-statement caches are shared. Engines are created once
+    per normalized URL with the same NullPool + SQLite foreign_keys setup as the session engine.
+    """
+    if db_url is None:
+        return engine
+    url = _normalize_sqlite_url(db_url)
+    if url == DB_URL:
+        return engine
+    with _reconfigure_lock:
+        eng = _ENGINES.get(url)
+        if eng is None:
+            eng = _ENGINES[url] = _create_engine(url)
+        return eng
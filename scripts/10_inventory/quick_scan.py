@@ -37,8 +37,17 @@ from __future__ import annotations
 
 import argparse
 import collections
+import collections.abc
+import concurrent.futures
+import functools
+import hashlib
+import heapq
 import json
+import mmap
+import operator
+import os
 import pathlib
+import pickle
 import re
 import sys
 from pathlib import Path
@@ -56,7 +65,11 @@ DEFAULT_FACTION_HINTS = {"stormcast","custodes","tau","aeldari","eldar","nurgle"
 VARIANT_AXES = {"split","parts","part","multi-part","multi_part","onepiece","one_piece","merged","solidpiece","hollow","hollowed","solid","presupported","pre-supported","pre_supported","supported","unsupported","no_supports","clean","bust","base_pack","bases_only","base_set","bits","bitz","accessories"}
 SCALE_RATIO_RE = re.compile(r"^1[-_:/]([0-9]{1,3})$")
 SCALE_MM_RE = re.compile(r"^([0-9]{2,3})mm$")
+# Both scale shapes in one pattern so classify_token runs a single match per non-vocab token
+SCALE_TOKEN_RE = re.compile(r"^(?:1[-_:/](?P<scale_ratio>[0-9]{1,3})|(?P<scale_mm>[0-9]{2,3})mm)$")
 ALLOWED_DENOMS = {4,6,7,9,10,12}
+DIGIT_RE = re.compile(r"\d")  # numeric-token check in C rather than a per-character generator
+VERSION_TOKEN_RE = re.compile(r"v\d+\Z")  # version-like tokens (v2, v10) for the report suggestions
 ARCHIVE_EXTS = {'.zip', '.rar', '.7z', '.cbz', '.cbr'}  # simple set (multi-suffix like .tar.gz not yet handled)
 
 # Runtime vocab (mutable): initialized with defaults, optionally replaced/extended by tokenmap parse
@@ -64,12 +77,47 @@ STOPWORDS = set(DEFAULT_STOPWORDS)
 DESIGNER_ALIASES = set(DEFAULT_DESIGNER_ALIASES)
 LINEAGE_FAMILY = set(DEFAULT_LINEAGE_FAMILY)
 FACTION_HINTS = set(DEFAULT_FACTION_HINTS)
+# token -> domain for every literal vocab set above; rebuilt after each vocab load so classify_token is one hash lookup
+VOCAB_DOMAIN: dict[str, str] = {}
 
 SPLIT_CHARS = re.compile(r"[\s_\-]+")
 TOKEN_MIN_LEN = 2
+NAME_TOKEN_CACHE_SIZE = 8192  # per-scan LRU of name -> tokens; bounded so memory stays flat on huge libraries
+# Separator-delimited parts of at least TOKEN_MIN_LEN chars in one C-level pass (shorter parts can never become tokens)
+TOKEN_PART_RE = re.compile(r"[^\s_\-]{2,}")
 TOKENMAP_VERSION: str | None = None
-TOKEN_LIST_PATTERN = re.compile(r'^\s*([a-z0-9_]+):\s*\[(.*?)\]\s*$')
+# One alternation covering every line shape load_tokenmap cares about (lastgroup names the shape).
+# Section headers win over entries, matching the original per-line precedence.
+# The optional \r before $ lets the bytes twin read CRLF files (the text path already gets '\n' line ends).
+TOKENMAP_LINE_PATTERN = re.compile(
+    r'^(?:(?P<header>[ \t]*(?P<section>designers|factions|stopwords):(?:[ \t]*\[(?P<inline>[^\]\n]*)\])?[^\n]*)'
+    r'|(?P<family_map>[^\n]*family_map:[^\n]*)'
+    r'|(?P<entry>[ \t]*[a-z0-9_]+:[ \t]*\[(?P<aliases>[^\n]*)\][ \t]*\r?)'
+    r'|(?P<blank>[ \t]*\r?))$',
+    re.M,
+)
+# bytes twin used by the --mmap-tokenmap path (regex runs over the mapped buffer without decoding the file)
+TOKENMAP_LINE_PATTERN_B = re.compile(TOKENMAP_LINE_PATTERN.pattern.encode(), re.M)
+TOKENMAP_VERSION_PATTERN = re.compile(r'token_map_version:\s*(\d+)')
+TOKENMAP_VERSION_PATTERN_B = re.compile(TOKENMAP_VERSION_PATTERN.pattern.encode())
 DESIGNER_SUFFIXES = ("studio","studios","miniature","miniatures","minis","prints","printing","figures","figure")
+# No suffix above ends another one, so at most one can match at the end of a token: one anchored search finds it
+DESIGNER_SUFFIX_RE = re.compile('(?:' + '|'.join(map(re.escape, DESIGNER_SUFFIXES)) + r')\Z')
+
+def rebuild_vocab_domain() -> dict[str, str]:
+    """Recompute VOCAB_DOMAIN from the runtime vocab sets.
+
+    Lowest-precedence domains are inserted first so stopword > designer > lineage_family > faction_hint > variant_axis.
+    """
+    global VOCAB_DOMAIN
+    domain: dict[str, str] = {}
+    for name, vocab in (("variant_axis", VARIANT_AXES), ("faction_hint", FACTION_HINTS), ("lineage_family", LINEAGE_FAMILY),
+                        ("designer", DESIGNER_ALIASES), ("stopword", STOPWORDS)):
+        domain.update(dict.fromkeys(vocab, name))
+    VOCAB_DOMAIN = domain
+    return domain
+
+rebuild_vocab_domain()
 
 def _split_alias_list(raw: str) -> list[str]:
     out = []
@@ -79,89 +127,166 @@ def _split_alias_list(raw: str) -> list[str]:
             out.append(part)
     return out
 
-def load_tokenmap(tokenmap_path: pathlib.Path) -> dict[str, int] | None:
-    """Parse minimal alias sets from tokenmap.md (designers, lineage family_map, factions, stopwords). Returns counts dict or None on failure."""
+def _tokenmap_lines(buf, pattern: re.Pattern, decode) -> list[tuple[str, str | None, str | None]]:
+    """(kind, section, raw alias list) for each line shape matched by a TOKENMAP_LINE_PATTERN variant (str or bytes)."""
+    lines: list[tuple[str, str | None, str | None]] = []
+    for m in pattern.finditer(buf):
+        kind = m.lastgroup
+        if kind == 'header':
+            inline = m.group('inline')
+            lines.append((kind, decode(m.group('section')), None if inline is None else decode(inline)))
+        elif kind == 'entry':
+            lines.append((kind, None, decode(m.group('aliases'))))
+        else:
+            lines.append((kind, None, None))
+    return lines
+
+def _decode_utf8(raw: bytes) -> str:
+    return raw.decode('utf-8', errors='ignore')
+
+def _cached_parse(path: pathlib.Path, cache_dir: pathlib.Path | None, parse):
+    """parse(path), reusing a pickle in cache_dir while the file's path, mtime and size are unchanged.
+
+    The key also carries the parser's name and the line pattern, so an entry written by one parse mode
+    (text vs --mmap-tokenmap) is never served to the other and a parser change invalidates old entries.
+    Cache read/write problems are ignored (the file is simply parsed again).
+    """
+    if cache_dir is None:
+        return parse(path)
+    try:
+        st = path.stat()
+        resolved = str(path.resolve())
+    except OSError:
+        return parse(path)
+    key = (resolved, st.st_mtime_ns, st.st_size, parse.__name__, TOKENMAP_LINE_PATTERN.pattern)
+    cache_file = cache_dir / f"tokenmap_{hashlib.sha1(resolved.encode('utf-8')).hexdigest()[:16]}.pkl"
+    try:
+        with open(cache_file, 'rb') as fh:
+            cached_key, parsed = pickle.load(fh)  # noqa: S301 - user-chosen local cache written by this script
+        if cached_key == key:
+            return parsed
+    except Exception:
+        pass
+    parsed = parse(path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix('.tmp')
+        with open(tmp, 'wb') as fh:
+            pickle.dump((key, parsed), fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        print(f"[warn] could not write tokenmap cache: {e}")
+    return parsed
+
+def _parse_tokenmap_text(path: pathlib.Path) -> tuple[str | None, list]:
+    text = path.read_text(encoding='utf-8', errors='ignore')
+    m_ver = TOKENMAP_VERSION_PATTERN.search(text)
+    return (m_ver.group(1) if m_ver else None), _tokenmap_lines(text, TOKENMAP_LINE_PATTERN, str)
+
+def _parse_tokenmap_mmap(path: pathlib.Path) -> tuple[str | None, list]:
+    if not path.stat().st_size:
+        return _parse_tokenmap_text(path)
+    with open(path, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        m_ver = TOKENMAP_VERSION_PATTERN_B.search(mm)
+        version = _decode_utf8(m_ver.group(1)) if m_ver else None
+        return version, _tokenmap_lines(mm, TOKENMAP_LINE_PATTERN_B, _decode_utf8)
+
+def load_tokenmap(tokenmap_path: pathlib.Path, use_mmap: bool = False, cache_dir: pathlib.Path | None = None) -> dict[str, int] | None:
+    """Parse minimal alias sets from tokenmap.md (designers, lineage family_map, factions, stopwords). Returns counts dict or None on failure.
+
+    With use_mmap the file is memory-mapped and scanned with the bytes pattern; only matched groups are decoded.
+    With cache_dir the parsed lines are pickled there and reused until the file changes.
+    """
     global STOPWORDS, DESIGNER_ALIASES, LINEAGE_FAMILY, FACTION_HINTS, TOKENMAP_VERSION
     try:
-        text = tokenmap_path.read_text(encoding='utf-8', errors='ignore')
+        version, lines = _cached_parse(tokenmap_path, cache_dir, _parse_tokenmap_mmap if use_mmap else _parse_tokenmap_text)
     except Exception as e:  # pragma: no cover
         print(f"[warn] Failed to read tokenmap: {e}")
         return None
-    m_ver = re.search(r'token_map_version:\s*(\d+)', text)
-    if m_ver:
-        TOKENMAP_VERSION = m_ver.group(1)
+    if version:
+        TOKENMAP_VERSION = version
     designers_added = lineage_added = factions_added = stopwords_added = 0
-    in_designers = False
-    in_family_map = False
-    in_factions = False
-    in_stopwords = False
-    for line in text.splitlines():
-        stripped = line.strip()
-        if not stripped:
-            if in_designers: in_designers = False
-            if in_family_map: in_family_map = False
-            if in_stopwords: in_stopwords = False
-        if stripped.startswith('designers:'):
-            in_designers = True
-            continue
-        if 'family_map:' in stripped:
-            in_family_map = True
-            continue
-        if stripped.startswith('factions:'):
-            in_factions = True
-            continue
-        if stripped.startswith('stopwords:'):
-            in_stopwords = True
-            m_inline = re.search(r'stopwords:\s*\[(.*?)\]', stripped)
-            if m_inline:
-                for tok in _split_alias_list(m_inline.group(1)):
+    # Single sweep over the whole text; a blank line closes whichever section is open.
+    section: str | None = None
+    for kind, header, raw_list in lines:
+        if kind == 'blank':
+            section = None
+        elif kind == 'header':
+            section = header
+            if section == 'stopwords' and raw_list is not None:
+                for tok in _split_alias_list(raw_list):
                     if tok not in STOPWORDS:
                         STOPWORDS.add(tok)
                         stopwords_added += 1
-            continue
-        m_list = TOKEN_LIST_PATTERN.match(line)
-        if m_list:
-            key, raw_list = m_list.groups()
+        elif kind == 'family_map':
+            section = 'family_map'
+        elif kind == 'entry':
             aliases = _split_alias_list(raw_list)
-            if in_designers:
+            if section == 'designers':
                 for a in aliases:
                     if a not in DESIGNER_ALIASES:
                         DESIGNER_ALIASES.add(a); designers_added += 1
-            elif in_family_map:
+            elif section == 'family_map':
                 for a in aliases:
                     if a not in LINEAGE_FAMILY:
                         LINEAGE_FAMILY.add(a); lineage_added += 1
-            elif in_factions:
+            elif section == 'factions':
                 for a in aliases:
                     if a not in FACTION_HINTS:
                         FACTION_HINTS.add(a); factions_added += 1
-            continue
+    rebuild_vocab_domain()
     return {'designers_added': designers_added,'lineage_added': lineage_added,'faction_aliases_added': factions_added,'stopwords_added': stopwords_added}
 
-def load_external_designers(designers_path: pathlib.Path) -> int:
+def load_external_designers(designers_path: pathlib.Path, cache_dir: pathlib.Path | None = None) -> int:
     """Load only designers section from external designers_tokenmap.md. Returns count added."""
     global DESIGNER_ALIASES
     try:
-        text = designers_path.read_text(encoding='utf-8', errors='ignore')
+        _, lines = _cached_parse(designers_path, cache_dir, _parse_tokenmap_text)
     except Exception:
         return 0
     in_designers = False
     added = 0
-    for line in text.splitlines():
-        stripped = line.strip()
-        if not stripped:
-            if in_designers: in_designers = False
-        if stripped.startswith('designers:'):
+    for kind, header, raw_list in lines:
+        if kind == 'blank':
+            in_designers = False
+        elif kind == 'header' and header == 'designers':
             in_designers = True
-            continue
-        m_list = TOKEN_LIST_PATTERN.match(line)
-        if m_list and in_designers:
-            _, raw_list = m_list.groups()
+        elif kind == 'entry' and in_designers:
             for a in _split_alias_list(raw_list):
                 if a not in DESIGNER_ALIASES:
                     DESIGNER_ALIASES.add(a); added += 1
+    rebuild_vocab_domain()
     return added
 
+KNOWN_EXTS = {"stl","obj","3mf","gltf","glb","lys","chitubox","ctb","step","ztl","zip","rar","7z","cbz","cbr","png","jpg","jpeg","webp","pdf","txt"}
+
+def tokenize_component(comp: str) -> list[str]:
+    """Tokenize a single path component (directory or file name)."""
+    tokens: list[str] = []
+    # Remove file extension only when the dot denotes a likely extension (e.g., file.ext)
+    if '.' in comp:
+        base, ext = comp.rsplit('.', 1)
+        ext_l = ext.lower().strip()
+        if ext_l in KNOWN_EXTS or (ext_l.isalpha() and 1 <= len(ext_l) <= 5):
+            comp = base
+    # Lowercase and pull out the parts between configured separator chars
+    for p in TOKEN_PART_RE.findall(comp.lower()):
+        # Plain alphanumeric parts (the vast majority) have nothing to strip
+        if p.isalnum():
+            tokens.append(p)
+            continue
+        # Normalize wrapper punctuation and leading markers to reduce noisy variants
+        p = p.strip("()[]{}+")
+        # Remove leading '@' (social/source markers) and trailing '+' artifacts
+        if p.startswith('@'):
+            p = p[1:]
+        # Collapse trailing extension remnants in token (e.g., 'unsupported.stl')
+        if p.endswith('.stl'):
+            p = p[:-4]
+        if len(p) >= TOKEN_MIN_LEN:
+            tokens.append(p)
+    return tokens
+
 def tokenize(path: pathlib.Path) -> list[str]:
     # Tokenize across all path components (directories + final name) so that
     # meaningful names embedded in directory structure (e.g., "Store/Artist - Ryuko Matoi/Model")
@@ -169,115 +294,217 @@ def tokenize(path: pathlib.Path) -> list[str]:
     s = str(path)
     # Normalize Windows backslashes to forward slashes for consistent splitting
     s = s.replace('\\', '/')
-    comps = [c for c in s.split('/') if c]
     tokens: list[str] = []
-    KNOWN_EXTS = {"stl","obj","3mf","gltf","glb","lys","chitubox","ctb","step","ztl","zip","rar","7z","cbz","cbr","png","jpg","jpeg","webp","pdf","txt"}
-    for comp in comps:
-        # Remove file extension only when the dot denotes a likely extension (e.g., file.ext)
-        if '.' in comp:
-            base, ext = comp.rsplit('.', 1)
-            ext_l = ext.lower().strip()
-            if ext_l in KNOWN_EXTS or (ext_l.isalpha() and 1 <= len(ext_l) <= 5):
-                comp = base
-        # Lowercase and split on configured separator chars
-        raw = comp.lower()
-        parts = SPLIT_CHARS.split(raw)
-        for p in parts:
-            p = p.strip()
-            if not p or len(p) < TOKEN_MIN_LEN:
-                continue
-            # Normalize wrapper punctuation and leading markers to reduce noisy variants
-            p = p.strip("()[]{}+")
-            # Remove leading '@' (social/source markers) and trailing '+' artifacts
-            if p.startswith('@'):
-                p = p[1:]
-            # Collapse trailing extension remnants in token (e.g., 'unsupported.stl')
-            if p.endswith('.stl'):
-                p = p[:-4]
-            if not p or len(p) < TOKEN_MIN_LEN:
-                continue
-            tokens.append(p)
+    for comp in s.split('/'):
+        if comp:
+            tokens.extend(tokenize_component(comp))
     return tokens
 
+@functools.lru_cache(maxsize=4096)
+def _tokenize_lowered(path_lower: str) -> tuple[str, ...]:
+    return tuple(tokenize(pathlib.Path(path_lower)))
+
+def tokenize_cached(path: pathlib.Path | str) -> tuple[str, ...]:
+    """tokenize() memoized per process, for callers that re-tokenize repeated or overlapping paths.
+
+    Keyed on the lowercased path string: tokens are lowercase anyway, so case variants (Windows) share an entry.
+    """
+    return _tokenize_lowered(str(path).lower())
+
 def classify_token(tok: str) -> str | None:
-    if tok in STOPWORDS: return "stopword"
-    if tok in DESIGNER_ALIASES: return "designer"
-    if tok in LINEAGE_FAMILY: return "lineage_family"
-    if tok in FACTION_HINTS: return "faction_hint"
-    if tok in VARIANT_AXES: return "variant_axis"
-    if SCALE_RATIO_RE.match(tok): return "scale_ratio"
-    if SCALE_MM_RE.match(tok): return "scale_mm"
+    domain = VOCAB_DOMAIN.get(tok)
+    if domain: return domain
+    m = SCALE_TOKEN_RE.match(tok)
+    if m: return m.lastgroup
     return None
 
 def maybe_strip_designer_suffix(tok: str) -> str:
     # Only strip if token longer than suffix+1 and endswith suffix; return stripped if result in designer aliases
-    for suf in DESIGNER_SUFFIXES:
-        if tok.endswith(suf) and len(tok) > len(suf)+1:
-            base = tok[:-len(suf)]
-            if base in DESIGNER_ALIASES:
-                return base
+    m = DESIGNER_SUFFIX_RE.search(tok)
+    if m and m.start() > 1:
+        base = tok[:m.start()]
+        if base in DESIGNER_ALIASES:
+            return base
     return tok
 
-def scan(root: pathlib.Path, limit: int, exts: set[str], unknown_top: int, skip_dirs: bool, ignore_set: set[str], emit_known_summary: bool, include_archives: bool, archive_sample: int, strip_suffixes: bool) -> dict:
+def _list_dir(dirpath: str) -> tuple[list[str], list[str], list[str]] | None:
+    """(dirnames, filenames, paths to descend into) for one directory, or None when it cannot be read."""
+    dirnames: list[str] = []
+    filenames: list[str] = []
+    descend: list[str] = []
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    filenames.append(entry.name)
+                elif entry.name.lower() != "__macosx":
+                    dirnames.append(entry.name)
+                    if not entry.is_symlink():
+                        descend.append(entry.path)
+    except OSError:
+        return None
+    return dirnames, filenames, descend
+
+def _walk_tree(top: str, pool: concurrent.futures.Executor | None = None) -> collections.abc.Iterator[tuple[str, list[str], list[str]]]:
+    """Top-down (dirpath, dirnames, filenames) walk built directly on os.scandir, in os.walk order.
+
+    '__MACOSX' folders are dropped while listing. Symlinked directories are reported but not descended into,
+    using the DirEntry's cached type instead of os.walk's extra lstat per subdirectory. Unreadable
+    directories are skipped like os.walk does by default.
+    With a pool, subdirectory listings are submitted as soon as their parent is listed so directory I/O
+    overlaps with the caller's tokenizing; the yield order is unchanged.
+    """
+    if pool is None:
+        stack: list = [(top, None)]
+    else:
+        stack = [(top, pool.submit(_list_dir, top))]
+    try:
+        while stack:
+            dirpath, pending = stack.pop()
+            listing = _list_dir(dirpath) if pending is None else pending.result()
+            if listing is None:
+                continue
+            dirnames, filenames, descend = listing
+            yield dirpath, dirnames, filenames
+            if pool is None:
+                stack.extend((d, None) for d in reversed(descend))
+            else:
+                stack.extend((d, pool.submit(_list_dir, d)) for d in reversed(descend))
+    finally:
+        # Early stop (--limit): drop listings nobody will consume
+        for _, pending in stack:
+            if pending is not None:
+                pending.cancel()
+
+def scan(root: pathlib.Path, limit: int, exts: set[str], unknown_top: int, skip_dirs: bool, ignore_set: set[str], emit_known_summary: bool, include_archives: bool, archive_sample: int, strip_suffixes: bool, workers: int = 1) -> dict:
     file_count = dir_count = 0
     archive_count = 0
     token_counter: collections.Counter[str] = collections.Counter()
     token_domain: dict[str, str] = {}
-    numeric_like: collections.Counter[str] = collections.Counter()
     archive_token_set: set[str] = set()
     token_from_archive: set[str] = set()
-    for p in root.rglob('*'):
-        # Global skip: ignore any paths that live under macOS metadata folders
-        try:
-            parts_lower = {part.lower() for part in p.parts}
-        except Exception:
-            parts_lower = set()
-        if "__macosx" in parts_lower:
-            continue
-        if p.is_dir():
-            if skip_dirs: continue
-            for tok in tokenize(p):
+    # str.endswith accepts a tuple: one C-level call per file instead of Path.suffix + lower + set probe
+    ext_tuple = tuple(e.lower() for e in exts)
+    archive_ext_tuple = tuple(ARCHIVE_EXTS)
+    # Per-token work stays in the interpreter, so bind the hot-loop callables to locals once
+    # (fast local loads instead of a global/attribute lookup for every token).
+    strip_suffix = maybe_strip_designer_suffix
+    add_archive_tokens = token_from_archive.update
+    # Counter.update counts a whole token list in C instead of a += per token
+    count_tokens = token_counter.update
+    join = os.path.join
+    vocab = VOCAB_DOMAIN
+    scale_match = SCALE_TOKEN_RE.match
+    has_digit = DIGIT_RE.search
+
+    # Libraries repeat the same component names ('Base.stl', 'Supported', 'Head_01.stl') across thousands of
+    # folders, so recently seen names reuse their token list. Bounded: most file names are unique, and an
+    # unbounded memo would grow with the library. Callers only concatenate the cached lists.
+    tokenize_name = functools.lru_cache(maxsize=NAME_TOKEN_CACHE_SIZE)(tokenize_component)
+
+    # Tokens already known to have no domain, so repeats skip classification entirely
+    unclassified: set[str] = set()
+    # Parsed number of each scale token (denominator or mm), kept from its one classification match
+    scale_values: dict[str, int] = {}
+
+    def tag_domains(tokens: list[str]) -> None:
+        # Domain tagging per token batch: each distinct token is classified once per scan. Vocab hits come
+        # from one C-level set intersection, only the leftovers are tried against the scale pattern
+        # (same result as classify_token per token).
+        batch = set(tokens)
+        batch.difference_update(token_domain)
+        batch.difference_update(unclassified)
+        if not batch:
+            return
+        for tok in vocab.keys() & batch:
+            token_domain[tok] = vocab[tok]
+        for tok in batch.difference(vocab):
+            m = scale_match(tok)
+            if m:
+                token_domain[tok] = m.lastgroup
+                scale_values[tok] = int(m[m.lastgroup])
+            else: unclassified.add(tok)
+
+    # --workers > 1 lists directories ahead of the walk on a thread pool (I/O-bound on network/HDD libraries)
+    pool = None
+    # Ignore everything when the root itself lives under a macOS metadata folder
+    if "__macosx" in {part.lower() for part in root.parts}:
+        walk = iter(())
+    else:
+        if workers > 1:
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        walk = _walk_tree(os.fspath(root), pool)
+    # Each directory's path is tokenized once (when its parent lists it) and reused for all of its children
+    dir_path_tokens: dict[str, list[str]] = {os.fspath(root): tokenize(root)}
+    # With --skip-dirs a subdirectory's own name is only tokenized once the walk enters it (--limit may stop first)
+    parent_path_tokens: dict[str, list[str]] = {}
+    for dirpath, dirnames, filenames in walk:
+        base_tokens = dir_path_tokens.pop(dirpath, None)
+        if base_tokens is None:
+            parent_tokens = parent_path_tokens.pop(dirpath, None)
+            if parent_tokens is not None:
+                base_tokens = parent_tokens + tokenize_name(os.path.basename(dirpath))
+            else:
+                base_tokens = tokenize(pathlib.Path(dirpath))
+        if skip_dirs:
+            # Directory names are not counted: just hand each subdirectory its parent's tokens
+            for d in dirnames:
+                parent_path_tokens[join(dirpath, d)] = base_tokens
+        else:
+            for d in dirnames:
+                dir_tokens = base_tokens + tokenize_name(d)
+                dir_path_tokens[join(dirpath, d)] = dir_tokens
                 if strip_suffixes:
-                    tok = maybe_strip_designer_suffix(tok)
-                domain = classify_token(tok)
-                token_counter[tok] += 1
-                if domain: token_domain.setdefault(tok, domain)
-                if any(c.isdigit() for c in tok): numeric_like[tok] += 1
-            dir_count += 1
-            continue
-        # Skip macOS sidecar files
-        try:
-            if p.name == ".DS_Store" or p.name.startswith("._"):
+                    dir_tokens = [strip_suffix(tok) for tok in dir_tokens]
+                count_tokens(dir_tokens)
+                tag_domains(dir_tokens)
+                dir_count += 1
+        for name in filenames:
+            # Skip macOS sidecar files
+            if name == ".DS_Store" or name.startswith("._"):
                 continue
-        except Exception:
-            pass
-        suffix = p.suffix.lower()
-        is_archive = suffix in ARCHIVE_EXTS if include_archives else False
-        if exts and suffix not in exts and not is_archive:
-            continue
-        if is_archive:
-            archive_count += 1
-        file_count += 1
-        for tok in tokenize(p):
+            name_l = name.lower()
+            is_archive = name_l.endswith(archive_ext_tuple) if include_archives else False
+            if ext_tuple and not name_l.endswith(ext_tuple) and not is_archive:
+                continue
+            if is_archive:
+                archive_count += 1
+            file_count += 1
+            file_tokens = base_tokens + tokenize_name(name)
             if strip_suffixes:
-                tok = maybe_strip_designer_suffix(tok)
-            domain = classify_token(tok)
-            token_counter[tok] += 1
-            if domain: token_domain.setdefault(tok, domain)
-            if any(c.isdigit() for c in tok): numeric_like[tok] += 1
+                file_tokens = [strip_suffix(tok) for tok in file_tokens]
+            count_tokens(file_tokens)
             if is_archive:
-                token_from_archive.add(tok)
+                add_archive_tokens(file_tokens)
+            tag_domains(file_tokens)
+            if limit and file_count >= limit: break
         if limit and file_count >= limit: break
+    if pool is not None:
+        walk.close()
+        pool.shutdown(cancel_futures=True)
     # Build unknown list excluding user ignored tokens
-    unknown: list[tuple[str,int]] = []
-    for tok, cnt in token_counter.most_common():
-        if tok in token_domain:
-            continue
-        if tok in ignore_set:
-            continue
-        unknown.append((tok, cnt))
-        if len(unknown) >= unknown_top:
-            break
+    # One pass over the counter buckets every token: unknown candidates, scale tokens (classified and parsed
+    # during the walk, so no regex is re-run here) and digit-bearing tokens (derived here, not counted in the walk)
+    # Classified and user-ignored tokens merged once so each candidate costs a single set probe
+    excluded = ignore_set.union(token_domain)
+    unknown_candidates: list[tuple[str, int]] = []
+    ratios_raw: list[tuple[str, int, int]] = []
+    mms_raw: list[tuple[str, int, int]] = []
+    numeric_candidates: list[tuple[str, int]] = []
+    for t, c in token_counter.items():
+        if has_digit(t):
+            numeric_candidates.append((t, c))
+        if t not in excluded:
+            unknown_candidates.append((t, c))
+        elif t in scale_values:
+            if token_domain[t] == "scale_ratio": ratios_raw.append((t, c, scale_values[t]))
+            else: mms_raw.append((t, c, scale_values[t]))
+    # Partial selection (O(D log K)) instead of fully sorting every distinct token; ties keep first-seen order
+    unknown: list[tuple[str,int]] = heapq.nlargest(unknown_top, unknown_candidates, key=operator.itemgetter(1))
     ignored_tokens = [{"token": t, "count": token_counter[t], "reason": "user_ignore"} for t in sorted(ignore_set) if t in token_counter]
 
     # Archive-only sample (tokens that occur only in archive filenames, not classified, not ignored, not already in top unknown)
@@ -285,30 +512,25 @@ def scan(root: pathlib.Path, limit: int, exts: set[str], unknown_top: int, skip_
     if archive_sample > 0 and token_from_archive:
         unknown_tokens_set = {t for t,_ in unknown}
         for tok in token_from_archive:
-            if tok in token_domain: continue
-            if tok in ignore_set: continue
+            if tok in excluded: continue
             if tok in unknown_tokens_set: continue
             # Only include tokens predominantly archive-sourced (heuristic: frequency <=2 or appears only in archives)
             archive_token_set.add(tok)
-        # Sort archive-only tokens by count desc then alpha
-        sorted_arch = sorted( ((t, token_counter[t]) for t in archive_token_set), key=lambda x: (-x[1], x[0]) )
-        for t,c in sorted_arch[:archive_sample]:
+        # Top archive-only tokens by count desc then alpha (bounded selection, not a full sort)
+        top_arch = heapq.nsmallest(archive_sample, ((t, token_counter[t]) for t in archive_token_set), key=lambda x: (-x[1], x[0]))
+        for t,c in top_arch:
             archive_sample_list.append({"token": t, "count": c})
-    ratios_raw = [(t, c) for t, c in token_counter.items() if classify_token(t) == "scale_ratio"]
-    mms_raw = [(t, c) for t, c in token_counter.items() if classify_token(t) == "scale_mm"]
     ratios = []
-    for t, c in sorted(ratios_raw, key=lambda x: -x[1]):
-        denom = int(SCALE_RATIO_RE.match(t).group(1))
+    for t, c, denom in sorted(ratios_raw, key=lambda x: -x[1]):
         ratios.append({"token": t, "denominator": denom, "count": c, "uncommon": denom not in ALLOWED_DENOMS})
     mm_entries = []
-    for t, c in sorted(mms_raw, key=lambda x: -x[1]):
-        mm = int(SCALE_MM_RE.match(t).group(1))
+    for t, c, mm in sorted(mms_raw, key=lambda x: -x[1]):
         mm_entries.append({"token": t, "mm": mm, "count": c})
-    numeric_tokens = [{"token": tok, "count": cnt} for tok, cnt in numeric_like.most_common(30)]
+    numeric_tokens = [{"token": tok, "count": cnt} for tok, cnt in heapq.nlargest(30, numeric_candidates, key=operator.itemgetter(1))]
     suggestions: list[str] = []
     if unknown: suggestions.append("Review top unknown tokens for new designer aliases, factions, or lineage expansions.")
     if ratios or mm_entries: suggestions.append("Validate scale tokens; add uncommon denominators to suspect list if legitimate.")
-    if any(tok.startswith('v') and tok[1:].isdigit() for tok in token_counter): suggestions.append("Detected version-like tokens; ensure version_num extraction pattern covers them.")
+    if any(map(VERSION_TOKEN_RE.match, token_counter)): suggestions.append("Detected version-like tokens; ensure version_num extraction pattern covers them.")
     suggestions.append("Consider capturing any high-frequency unknowns appearing across >5% of scanned files.")
     print(f"Scanned files: {file_count}")
     if include_archives and archive_count:
@@ -341,7 +563,7 @@ def scan(root: pathlib.Path, limit: int, exts: set[str], unknown_top: int, skip_
     domain_summary = {}
     if emit_known_summary:
         inv: dict[str,int] = collections.Counter(token_domain.values())
-        domain_summary = dict(inv)
+        domain_summary = dict(sorted(inv.items()))
         if emit_known_summary:
             print("\nKnown domain summary:")
             for k,v in sorted(domain_summary.items()):
@@ -363,6 +585,30 @@ def scan(root: pathlib.Path, limit: int, exts: set[str], unknown_top: int, skip_
     "archive_token_sample": archive_sample_list,
     }
 
+def write_json_report(report: dict, out_path: pathlib.Path) -> None:
+    """Write report as indented JSON one field / list element at a time (same text as json.dumps(report, indent=2)).
+
+    List fields may also be iterators, so large sections (e.g. a big --unknown-top) are never rendered as one string.
+    """
+    with out_path.open('w', encoding='utf-8') as fh:
+        fh.write('{')
+        first = True
+        for key, value in report.items():
+            fh.write('\n  ' if first else ',\n  ')
+            first = False
+            fh.write(json.dumps(key) + ': ')
+            if isinstance(value, (list, tuple, collections.abc.Iterator)):
+                fh.write('[')
+                empty = True
+                for item in value:
+                    fh.write('\n    ' if empty else ',\n    ')
+                    fh.write(json.dumps(item, indent=2).replace('\n', '\n    '))
+                    empty = False
+                fh.write(']' if empty else '\n  ]')
+            else:
+                fh.write(json.dumps(value, indent=2).replace('\n', '\n  '))
+        fh.write('}' if first else '\n}')
+
 def parse_args(argv: list[str]) -> argparse.Namespace:
     ap = argparse.ArgumentParser(description="Quick token frequency scan (if --root omitted, uses script directory)")
     ap.add_argument('--root', help='Root directory to scan (defaults to folder containing this script)')
@@ -372,11 +618,14 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     ap.add_argument('--unknown-top', type=int, default=300, help='How many top unknown tokens to include')
     ap.add_argument('--skip-dirs', action='store_true', help='Skip tokenizing directory names (default includes)')
     ap.add_argument('--tokenmap', help='Path to tokenmap.md to dynamically load vocab (aliases, lineage, factions, stopwords)')
+    ap.add_argument('--mmap-tokenmap', action='store_true', help='Memory-map the tokenmap and parse it as bytes (decodes matched aliases only)')
+    ap.add_argument('--tokenmap-cache', help='Directory for pickled tokenmap/designers parses, reused until the source file changes')
     ap.add_argument('--ignore-file', help='Path to newline-delimited token ignore list (one token per line; # comments allowed)')
     ap.add_argument('--emit-known-summary', action='store_true', help='Include summary counts of classified tokens by domain')
     ap.add_argument('--include-archives', action='store_true', help='Include archive filenames (.zip/.rar/.7z/.cbz/.cbr) without extraction')
     ap.add_argument('--archive-sample', type=int, default=0, help='Show up to N archive-only tokens that did not make top unknown list')
     ap.add_argument('--designers-file', help='Optional external designers_tokenmap.md file to preload designer aliases')
+    ap.add_argument('--workers', type=int, default=1, help='Threads used to list directories ahead of the scan (1 = sequential)')
     ap.add_argument('--strip-designer-suffixes', action='store_true', help='Strip common designer suffixes (studio/minis/prints/figures) after alias match to reduce variant noise')
     return ap.parse_args(argv)
 
@@ -389,6 +638,7 @@ def main(argv: list[str]) -> int:
     if not root.exists() or not root.is_dir():
         print(f"Root not found or not directory: {root}", file=sys.stderr); return 2
     exts = {e.lower() for e in args.extensions}
+    cache_dir = pathlib.Path(args.tokenmap_cache) if args.tokenmap_cache else None
     # Load external designers first (if provided or exists by default name)
     if args.designers_file:
         dpath = pathlib.Path(args.designers_file)
@@ -403,7 +653,7 @@ def main(argv: list[str]) -> int:
                 print("[warn] using legacy root designers_tokenmap.md; migrate expected under vocab/" )
             dpath = legacy
     if dpath.exists():
-        added = load_external_designers(dpath)
+        added = load_external_designers(dpath, cache_dir=cache_dir)
         if added:
             print(f"[info] external designers loaded +{added} from {dpath.name}")
 
@@ -420,7 +670,7 @@ def main(argv: list[str]) -> int:
                 print("[warn] using legacy root tokenmap.md; migrate expected under vocab/")
             tm_path = legacy
     if tm_path.exists():
-        stats = load_tokenmap(tm_path)
+        stats = load_tokenmap(tm_path, use_mmap=args.mmap_tokenmap, cache_dir=cache_dir)
         if stats:
             print(f"[info] tokenmap loaded (version={TOKENMAP_VERSION}) designers+{stats['designers_added']} lineage+{stats['lineage_added']} faction_aliases+{stats['faction_aliases_added']} stopwords+{stats['stopwords_added']} from {tm_path}")
         else:
@@ -458,13 +708,13 @@ def main(argv: list[str]) -> int:
                 print(f"[warn] failed to read ignore file: {e}")
         else:
             print(f"[warn] ignore file not found: {ig_path}")
-    report = scan(root, args.limit, exts, args.unknown_top, args.skip_dirs, ignore_set, args.emit_known_summary, args.include_archives, args.archive_sample, args.strip_designer_suffixes)
+    report = scan(root, args.limit, exts, args.unknown_top, args.skip_dirs, ignore_set, args.emit_known_summary, args.include_archives, args.archive_sample, args.strip_designer_suffixes, workers=args.workers)
     if args.json_out: out_path = pathlib.Path(args.json_out)
     else:
         out_path = root / 'quick_scan_report.json'
         print(f"[info] --json-out not provided; defaulting to {out_path}")
     try:
-        out_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        write_json_report(report, out_path)
         print(f"\nJSON report written: {out_path}")
     except Exception as e:  # pragma: no cover
         print(f"Failed to write JSON report: {e}", file=sys.stderr)
@@ -142,8 +142,10 @@ def upsert_unit(
 
 
 def load_yaml(path: Path) -> Any:
-    yaml = YAML(typ="rt")
-    yaml.preserve_quotes = True
+    # Safe loader: plain dicts/lists (no round-trip comment/quote bookkeeping) and ruamel's
+    # C parser when ruamel.yaml.clib is installed. Duplicate keys keep the first definition,
+    # as the round-trip loader did; PyYAML would keep the last and change what gets loaded.
+    yaml = YAML(typ="safe")
     yaml.allow_duplicate_keys = True
     with path.open("r", encoding="utf-8") as f:
         return yaml.load(f)
@@ -162,25 +164,15 @@ def infer_system_from_filename(path: Path) -> Tuple[str, str]:
     return ("w40k", "Warhammer 40,000")
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Load codex units and parts from YAML into DB")
-    parser.add_argument("--file", required=True, help="Path to YAML file (codex_units_*.yaml, wargear_w40k.yaml, bodies_w40k.yaml)")
-    parser.add_argument("--system", choices=["w40k", "aos", "heresy", "old_world"], help="Override inferred system key")
-    parser.add_argument("--commit", action="store_true", help="Commit changes; otherwise dry-run")
-    parser.add_argument("--db-url", help="SQLAlchemy DB URL, e.g., sqlite:///./data/stl_manager_v1.db")
-    args = parser.parse_args()
-
-    db_url = args.db_url or os.environ.get("STLMGR_DB_URL", "sqlite:///./data/stl_manager.db")
-    os.environ["STLMGR_DB_URL"] = db_url
+def load_codex_file(yaml_path: Path, system_override: Optional[str] = None, commit: bool = False) -> None:
+    """Load one codex/parts YAML file in its own session (committed, or rolled back on dry-run)."""
     from db.session import get_session
-    ensure_tables(db_url)
 
-    yaml_path = Path(args.file)
     data = load_yaml(yaml_path)
 
     sys_key, sys_name = infer_system_from_filename(yaml_path)
-    if args.system:
-        sys_key = args.system
+    if system_override:
+        sys_key = system_override
         sys_name = {
             "w40k": "Warhammer 40,000",
             "aos": "Age of Sigmar",
@@ -542,7 +534,7 @@ def main() -> None:
                     if conv:
                         handle_units(None, None, conv, source_anchor=sect, force_category=cat)
 
-        if args.commit:
+        if commit:
             session.commit()
             print("Committed codex load.")
         else:
@@ -550,5 +542,26 @@ def main() -> None:
             print("Dry-run complete (no changes committed).")
 
 
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load codex units and parts from YAML into DB")
+    parser.add_argument("--file", required=True, action="append",
+                        help="Path to YAML file (codex_units_*.yaml, wargear_w40k.yaml, bodies_w40k.yaml); "
+                             "repeat to load several files, in order, in one run")
+    parser.add_argument("--system", choices=["w40k", "aos", "heresy", "old_world"],
+                        help="Override inferred system key (applies to every --file)")
+    parser.add_argument("--commit", action="store_true", help="Commit changes; otherwise dry-run")
+    parser.add_argument("--db-url", help="SQLAlchemy DB URL, e.g., sqlite:///./data/stl_manager_v1.db")
+    args = parser.parse_args()
+
+    db_url = args.db_url or os.environ.get("STLMGR_DB_URL", "sqlite:///./data/stl_manager.db")
+    os.environ["STLMGR_DB_URL"] = db_url
+    ensure_tables(db_url)
+
+    # Each file keeps its own session/commit, exactly as with one invocation per file
+    for f in args.file:
+        load_codex_file(Path(f), args.system, args.commit)
+
+
 if __name__ == "__main__":
     main()
@@ -111,14 +111,15 @@ def main(argv: list[str] | None = None) -> int:
             print("Dry-run: no DB changes made. Rerun with --apply to commit.")
             return 0
 
-        # Apply
-        for spec in to_create:
-            row = VocabEntry(domain="character", key=spec["key"], aliases=spec["aliases"], meta={"source": "vocab/franchises"})
-            session.add(row)
-        for upd in to_update:
-            row: VocabEntry = upd["row"]
-            spec = upd["spec"]
-            row.aliases = spec["aliases"]
+        # Apply: creates/updates are plain column writes, so use the bulk paths (no per-row unit-of-work bookkeeping)
+        session.bulk_insert_mappings(
+            VocabEntry,
+            [
+                {"domain": "character", "key": spec["key"], "aliases": spec["aliases"], "meta": {"source": "vocab/franchises"}}
+                for spec in to_create
+            ],
+        )
+        session.bulk_update_mappings(VocabEntry, [{"id": u["row"].id, "aliases": u["spec"]["aliases"]} for u in to_update])
         for row in to_delete:
             session.delete(row)
         session.commit()
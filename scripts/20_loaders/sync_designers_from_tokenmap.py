@@ -11,40 +11,40 @@ import ast
 import json
 import os
 import re
+from collections import defaultdict
 from pathlib import Path
 
-FENCE_RE = re.compile(r"^```")
-ENTRY_RE = re.compile(r"^\s*([A-Za-z0-9_\-]+)\s*:\s*(\[.*\])\s*$")
+# One pattern per line: either a ``` fence (group "fence") or a `key: [aliases]` entry
+LINE_RE = re.compile(r"^\s*(?:(?P<fence>```)|(?P<key>[A-Za-z0-9_\-]+)\s*:\s*(?P<aliases>\[.*\])\s*$)")
+
+
+def _parse_alias_list(aliases_str: str) -> list[str]:
+    # Entries are written as JSON-style double-quoted lists; json.loads parses those in C.
+    # Anything else (single quotes, Python escapes) falls back to literal_eval.
+    try:
+        aliases_obj = json.loads(aliases_str)
+    except ValueError:
+        try:
+            aliases_obj = ast.literal_eval(aliases_str)
+        except Exception:
+            return []
+    if not isinstance(aliases_obj, (list, tuple)):
+        return [str(aliases_obj)]
+    return [str(a) for a in aliases_obj]
 
 
 def parse_tokenmap(path: Path) -> dict[str, list[str]]:
     text = path.read_text(encoding="utf8")
-    lines = text.splitlines()
     inside = False
     result: dict[str, list[str]] = {}
-    for ln in lines:
-        if FENCE_RE.match(ln.strip()):
-            inside = not inside
-            continue
-        if not inside:
-            continue
-        ln = ln.rstrip()
-        if not ln or ln.lstrip().startswith("#"):
-            continue
-        m = ENTRY_RE.match(ln)
+    for ln in text.splitlines():
+        m = LINE_RE.match(ln)
         if not m:
             continue
-        key = m.group(1).strip()
-        aliases_str = m.group(2)
-        try:
-            aliases_obj = ast.literal_eval(aliases_str)
-            if not isinstance(aliases_obj, (list, tuple)):
-                aliases = [str(aliases_obj)]
-            else:
-                aliases = [str(a) for a in aliases_obj]
-        except Exception:
-            aliases = []
-        result[key] = aliases
+        if m.group("fence"):
+            inside = not inside
+        elif inside:
+            result[m.group("key")] = _parse_alias_list(m.group("aliases"))
     return result
 
 
@@ -74,6 +74,9 @@ def main(argv: list[str] | None = None) -> int:
     if args.db_url:
         os.environ["STLMGR_DB_URL"] = args.db_url
 
+    from sqlalchemy import update
+    from sqlalchemy.engine import Row
+
     from db.models import Variant, VocabEntry
     from db.session import get_session  # late import to honor --db-url
 
@@ -90,30 +93,36 @@ def main(argv: list[str] | None = None) -> int:
         rows = session.query(VocabEntry).filter_by(domain="designer").all()
         return [r for r in rows if r.key not in tokenmap_keys]
 
-    def find_variants_for_vocab(session, ve: VocabEntry) -> list[Variant]:
-        target_norm = normalize_alias(ve.key or "")
-        ve_alias_norms = [normalize_alias(x) for x in (ve.aliases or [])]
-        matches: list[Variant] = []
-        for v in session.query(Variant).filter(Variant.designer.isnot(None)).all():
-            dn = normalize_alias(str(v.designer))
-            if dn == target_norm or dn in ve_alias_norms:
-                matches.append(v)
-        return matches
-
-    def find_orphaned_variants(session) -> list[Variant]:
-        res: list[Variant] = []
-        for v in session.query(Variant).filter(Variant.designer.isnot(None)).all():
-            dn = normalize_alias(str(v.designer))
-            if dn not in alias_map:
-                res.append(v)
-        return res
+    def load_designer_variants(session) -> dict[str, list[tuple[int, Row]]]:
+        # Single streamed scan of (id, rel_path, designer) rows, bucketed by normalized designer; the index keeps
+        # query order. Plain column rows skip ORM instance construction and identity-map bookkeeping.
+        by_norm: dict[str, list[tuple[int, Row]]] = defaultdict(list)
+        q = session.query(Variant.id, Variant.rel_path, Variant.designer).filter(Variant.designer.isnot(None))
+        for idx, v in enumerate(q.yield_per(1000)):
+            by_norm[normalize_alias(str(v.designer))].append((idx, v))
+        return by_norm
+
+    def find_variants_for_vocab(by_norm: dict[str, list[tuple[int, Row]]], ve: VocabEntry) -> list[Row]:
+        norms = {normalize_alias(ve.key or "")}
+        norms.update(normalize_alias(x) for x in (ve.aliases or []))
+        hits = [hit for n in norms for hit in by_norm.get(n, ())]
+        hits.sort(key=lambda h: h[0])
+        return [v for _, v in hits]
+
+    def find_orphaned_variants(by_norm: dict[str, list[tuple[int, Row]]]) -> list[Row]:
+        hits = [hit for n, bucket in by_norm.items() if n not in alias_map for hit in bucket]
+        hits.sort(key=lambda h: h[0])
+        return [v for _, v in hits]
 
     with get_session() as session:
         stale = find_stale_vocab(session, tokenmap_keys)
+        by_norm = load_designer_variants(session)
         results = []
+        stale_matches: list[list[Row]] = []
         total_variant_hits = 0
         for ve in stale:
-            variants = find_variants_for_vocab(session, ve)
+            variants = find_variants_for_vocab(by_norm, ve)
+            stale_matches.append(variants)
             total_variant_hits += len(variants)
             results.append({
                 "vocab_id": ve.id,
@@ -123,7 +132,7 @@ def main(argv: list[str] | None = None) -> int:
                 "variant_sample": [{"id": v.id, "rel_path": v.rel_path, "designer": v.designer} for v in variants[:20]],
             })
 
-        orphaned = find_orphaned_variants(session)
+        orphaned = find_orphaned_variants(by_norm)
         orphaned_sample = [{"id": v.id, "rel_path": v.rel_path, "designer": v.designer} for v in orphaned[:20]]
 
         out = {
@@ -146,12 +155,16 @@ def main(argv: list[str] | None = None) -> int:
             return 0
 
         print("Applying changes: clearing designer on matched Variants and orphaned variants...")
-        for ve in stale:
-            variants = find_variants_for_vocab(session, ve)
-            for v in variants:
-                v.designer = None
-        for v in orphaned:
-            v.designer = None
+        clear_ids = sorted({v.id for variants in stale_matches for v in variants} | {v.id for v in orphaned})
+        # Bulk UPDATE in id batches (stays under SQLite's bound-parameter limit) instead of per-row attribute sets;
+        # rows already cleared (e.g. by an earlier run) are filtered out in SQL so they are not rewritten
+        for i in range(0, len(clear_ids), 500):
+            session.execute(
+                update(Variant)
+                .where(Variant.id.in_(clear_ids[i:i + 500]), Variant.designer.isnot(None))
+                .values(designer=None),
+                execution_options={"synchronize_session": False},
+            )
         if args.delete_vocab:
             print("Deleting stale VocabEntry rows...")
             for ve in stale:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import itertools
 import json
 import os
 from pathlib import Path
@@ -42,25 +43,40 @@ def main(argv: list[str] | None = None) -> int:
     created = 0
     updated = 0
     try:
+        # Preload every franchise entry once instead of one SELECT per franchise file
+        existing: dict[str, VocabEntry] = {}
+        for row in session.query(VocabEntry).filter_by(domain='franchise').all():
+            existing.setdefault(row.key, row)
+        # New rows / alias updates collected as plain mappings and written with the bulk APIs on --apply
+        to_insert: dict[str, dict] = {}
+        to_update: dict[int, dict] = {}
         for jf in sorted(fr_dir.glob('*.json')):
             info = load_tokens_for_franchise(jf)
             if not info:
                 continue
             key, aliases = info
-            ve = session.query(VocabEntry).filter_by(domain='franchise', key=key).one_or_none()
+            ve = existing.get(key)
             if ve:
                 # merge aliases
-                cur = set(ve.aliases or [])
-                new = set(aliases)
-                merged = sorted(cur.union(new))
-                if merged != (ve.aliases or []):
-                    ve.aliases = merged
-                    updated += 1
+                cur_aliases = to_update[ve.id]['aliases'] if ve.id in to_update else (ve.aliases or [])
+                cur = set(cur_aliases)
+                # Steady state on reruns: nothing new and the stored list is already sorted/unique, so skip the
+                # sort + list compare (strictly increasing neighbours == sorted(cur) for a list of strings)
+                if cur.issuperset(aliases) and all(a < b for a, b in itertools.pairwise(cur_aliases)):
+                    continue
+                merged = sorted(cur.union(aliases))
+                if merged != cur_aliases:
+                    if ve.id not in to_update:
+                        updated += 1
+                    to_update[ve.id] = {'id': ve.id, 'aliases': merged}
+            elif key in to_insert:
+                to_insert[key]['aliases'] = sorted(set(to_insert[key]['aliases']).union(aliases))
             else:
-                ve = VocabEntry(domain='franchise', key=key, aliases=aliases, meta={'source': 'vocab/franchises'})
-                session.add(ve)
+                to_insert[key] = {'domain': 'franchise', 'key': key, 'aliases': aliases, 'meta': {'source': 'vocab/franchises'}}
                 created += 1
         if args.apply:
+            session.bulk_insert_mappings(VocabEntry, list(to_insert.values()))
+            session.bulk_update_mappings(VocabEntry, list(to_update.values()))
             session.commit()
             print(f'Committed franchise alias sync: created={created} updated={updated}')
         else:
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import hashlib
+import heapq
 import json
 import re
 import sys
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
@@ -52,6 +55,9 @@ DEFAULT_SCALE_BY_SYSTEM: Dict[str, int] = {
 }
 
 
+# Pure str -> value helpers below are memoized: path segments and kit labels repeat across
+# sibling variants, and the same variant text is re-checked by the kit-child enrichment pass.
+@functools.lru_cache(maxsize=4096)
 def norm_text(s: str) -> str:
     s = s.lower()
     s = s.replace("warhammer 40,000", "w40k").replace("warhammer 40k", "w40k")
@@ -61,6 +67,7 @@ def norm_text(s: str) -> str:
     return re.sub(r"\s+", " ", s).strip()
 
 
+@functools.lru_cache(maxsize=256)
 def system_hint(text: str) -> Optional[str]:
     t = text.lower()
     if any(k in t for k in ["w40k", "40k", "wh40k", "warhammer 40"]):
@@ -130,13 +137,23 @@ MARINE_CONTEXT_TOKENS = [
 ]
 
 
+def _phrase_scan_re(phrases: List[str]) -> re.Pattern[str]:
+    """One pattern reporting every whole-word occurrence of any phrase (overlaps included, via lookahead)."""
+    return re.compile(r"(?=\b(" + "|".join(map(re.escape, phrases)) + r")\b)")
+
+
+# Single-sweep scanners over the hint tables, built once at import; callers keep table order as
+# the priority order by checking the set of hits against each table in turn.
+_LONG_FORM_HINT_RE = _phrase_scan_re([*CHAPTER_HINTS, *SUBFACTION_HINTS])
+_ABBREV_HINT_RE = _phrase_scan_re(list(ABBREV_HINTS))
+_MARINE_CONTEXT_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, MARINE_CONTEXT_TOKENS)) + r")\b")
+
+
 def _has_marine_context(v_text_norm: str) -> bool:
-    for tok in MARINE_CONTEXT_TOKENS:
-        if re.search(rf"\b{re.escape(tok)}\b", v_text_norm):
-            return True
-    return False
+    return _MARINE_CONTEXT_RE.search(v_text_norm) is not None
 
 
+@functools.lru_cache(maxsize=256)
 def find_chapter_hint(v_text_norm: str) -> Tuple[Optional[str], Optional[str]]:
     """Return (chapter_key, subfaction_key) hints from normalized text.
 
@@ -145,32 +162,35 @@ def find_chapter_hint(v_text_norm: str) -> Tuple[Optional[str], Optional[str]]:
     - Then abbreviations if Space Marine context is present. For 'dw', require a clear
       Terminator context to prefer Deathwing over Deathwatch.
     """
-    # Long-form chapters
-    for phrase, chap in CHAPTER_HINTS.items():
-        if re.search(rf"\b{re.escape(phrase)}\b", v_text_norm):
-            return chap, None
-
-    # Subfactions
-    for phrase, (chap, subf) in SUBFACTION_HINTS.items():
-        if re.search(rf"\b{re.escape(phrase)}\b", v_text_norm):
-            return chap, subf
+    long_hits = {m.group(1) for m in _LONG_FORM_HINT_RE.finditer(v_text_norm)}
+    if long_hits:
+        # Long-form chapters
+        for phrase, chap in CHAPTER_HINTS.items():
+            if phrase in long_hits:
+                return chap, None
+        # Subfactions
+        for phrase, (chap, subf) in SUBFACTION_HINTS.items():
+            if phrase in long_hits:
+                return chap, subf
 
     # Abbreviations (guarded)
     marine_ctx = _has_marine_context(v_text_norm)
     if marine_ctx:
+        abbr_hits = {m.group(1) for m in _ABBREV_HINT_RE.finditer(v_text_norm)}
         # Special-case 'dw' to require terminator in text for Deathwing
-        if re.search(r"\bdw\b", v_text_norm) and re.search(r"\bterminator\b", v_text_norm):
+        if "dw" in abbr_hits and re.search(r"\bterminator\b", v_text_norm):
             return "dark_angels", "deathwing"
         for abbr, (chap, subf) in ABBREV_HINTS.items():
             if abbr == "dw":
                 continue  # handled above
-            if re.search(rf"\b{re.escape(abbr)}\b", v_text_norm):
+            if abbr in abbr_hits:
                 return chap, subf
 
     return None, None
 
 
-@dataclass
+# Immutable, slot-backed: thousands are built per run from the alias index and never modified
+@dataclass(slots=True, frozen=True)
 class UnitRef:
     unit_id: int
     system_key: str
@@ -257,6 +277,8 @@ def build_unit_alias_index(session) -> Tuple[
     return idx, key_index, mount_children, spells_by_faction
 
 
+# find_best_matches asks for the same text twice (inject + bias), so cache per normalized text
+@functools.lru_cache(maxsize=256)
 def detect_mount_context(v_text_norm: str) -> Tuple[bool, Optional[str]]:
     """Detects mount context and mount type.
     Returns (is_mount_context, mount_type) where mount_type in {'terror', 'dragon', 'bat', None}.
@@ -336,10 +358,13 @@ def inject_mounted_candidates(results: List[Tuple[UnitRef, float, str]], mount_c
 # -----------------
 
 
+# Checked by both the spell injection and the spell bias pass for each variant text
+@functools.lru_cache(maxsize=256)
 def detect_spell_context(v_text_norm: str) -> bool:
     return bool(re.search(r"\b(spell|spells|endless spell|endless spells|manifestation|invocation)s?\b", v_text_norm))
 
 
+@functools.lru_cache(maxsize=256)
 def detect_aos_faction_hint(v_text_norm: str) -> Optional[str]:
     for phrase, fkey in AOS_FACTION_TOKENS_MAP.items():
         if re.search(rf"\b{re.escape(phrase)}\b", v_text_norm):
@@ -413,6 +438,13 @@ def text_for_variant(v: Variant) -> str:
         pass
     return norm_text(" ".join(parts))
 
+# Normalized path segments that carry no unit information (packaging / slicer folders)
+_NOISE = frozenset({
+    "stl", "supported stl", "unsupported", "presupported", "__macosx",
+    "combined", "lychee", "one page rules", "opr",
+})
+
+
 def _path_segments(rel_path: Optional[str]) -> List[str]:
     """Return normalized path segments from a rel_path, filtering noise tokens.
 
@@ -423,13 +455,9 @@ def _path_segments(rel_path: Optional[str]) -> List[str]:
         return []
     raw = re.split(r"[\\/]+", rel_path)
     segs: List[str] = []
-    NOISE = {
-        "stl", "supported stl", "unsupported", "presupported", "__macosx",
-        "combined", "lychee", "one page rules", "opr",
-    }
     for s in raw:
         n = norm_text(s)
-        if not n or n in NOISE:
+        if not n or n in _NOISE:
             continue
         segs.append(n)
     return segs
@@ -460,6 +488,16 @@ def score_match(alias_phrase: str, unit: UnitRef, v_text: str, sys_hint: Optiona
     return score
 
 
+_SCORE_KEY = itemgetter(1)
+
+
+def _top_results(results: List[Tuple[UnitRef, float, str]], top_k: Optional[int]) -> List[Tuple[UnitRef, float, str]]:
+    # nlargest is O(R log k) and returns the same (stable) order as sorted(...)[:k]
+    if top_k is None:
+        return results
+    return heapq.nlargest(top_k, results, key=_SCORE_KEY)
+
+
 def find_best_matches(
     idx: Dict[str, List[UnitRef]],
     v_text: str,
@@ -467,7 +505,15 @@ def find_best_matches(
     mount_children: Optional[Dict[str, List[UnitRef]]] = None,
     spells_by_faction: Optional[Dict[str, List[UnitRef]]] = None,
     path_segment_set: Optional[Set[str]] = None,
+    *,
+    sort: bool = True,
+    top_k: Optional[int] = None,
 ) -> List[Tuple[UnitRef, float, str]]:
+    """Score every unit whose phrase appears in *v_text*, best first.
+
+    ``sort=False`` skips the final score ordering for callers that only test membership;
+    ``top_k`` keeps just the N best results without sorting the whole list.
+    """
     # First collect all matched phrases
     matched: Dict[str, List[UnitRef]] = {}
     for phrase, refs in idx.items():
@@ -484,7 +530,7 @@ def find_best_matches(
             results = inject_spell_candidates(results, spells_by_faction, v_text)
             if results:
                 results = apply_spell_bias(results, v_text)
-        return results
+        return _top_results(results, top_k)
 
     # Prefer longest specific phrases: drop any phrase that is strictly contained
     # within another matched phrase. This avoids matching "assault squad" when
@@ -502,7 +548,10 @@ def find_best_matches(
         for ref in matched[phrase]:
             results.append((ref, score_match(phrase, ref, v_text, sys_hint, path_segment_set), phrase))
 
-    results.sort(key=lambda x: x[1], reverse=True)
+    # Mount injection only looks at the current top few, so it needs the ordering even when
+    # the caller does not; top_k selects its own best N below, so the full sort is skipped.
+    if (sort and top_k is None) or mount_children is not None:
+        results.sort(key=_SCORE_KEY, reverse=True)
     # Inject mounted candidates and apply mount bias if context detected
     if mount_children is not None:
         results = inject_mounted_candidates(results, mount_children, v_text)
@@ -510,7 +559,7 @@ def find_best_matches(
     if spells_by_faction is not None:
         results = inject_spell_candidates(results, spells_by_faction, v_text)
         results = apply_spell_bias(results, v_text)
-    return results
+    return _top_results(results, top_k)
 
 
 def _enrich_kit_child(v: Variant, parent_v: Optional[Variant], session, args) -> None:
@@ -32,8 +32,7 @@ from scripts.lib.alias_rules import (
 # Reuse tokenizer and tokenmap loader from quick_scan to keep behavior consistent
 from scripts.quick_scan import (
     ALLOWED_DENOMS,
-    SCALE_MM_RE,
-    SCALE_RATIO_RE,
+    SCALE_TOKEN_RE,
     SPLIT_CHARS,
     classify_token,
     load_tokenmap,
@@ -151,6 +150,11 @@ UNDEAD_HINTS = {"undead","vampire","vampires","vampiric","wight","wights","skele
 # --- Lightweight parsers for selected tokenmap.md domains (conservative) ---
 _TOKENLIST_RE = re.compile(r"^\s*([a-z0-9_]+):\s*\[(.*?)\]\s*$", re.IGNORECASE)
 
+# Split-token scale detection in classify_tokens ("1", "6scale" / "scale", "1", "10" / "6scale")
+_SPLIT_DEN_RE = re.compile(r"^([0-9]{1,3})(?:scale)?$")
+_DEN_DIGITS_RE = re.compile(r"[0-9]{2,3}")
+_DEN_SCALE_RE = re.compile(r"([0-9]{1,3})scale")
+
 def _split_list(raw: str) -> list[str]:
     out: list[str] = []
     for part in raw.split(','):
@@ -575,6 +579,108 @@ def infer_segmentation_from_siblings(session, variant: Variant, current_segmenta
     return (current_segmentation, False)
 
 
+def resolve_lineage(tokens: Iterable[str], lineage_candidates: Optional[list[tuple[int, str]]] = None) -> tuple[Optional[str], list[str]]:
+    """Pick lineage_family for a token sequence; return (lineage_family, warnings).
+
+    lineage_candidates are the (index, token) pairs already classified as
+    lineage_family by the caller; when omitted they are derived via classify_token.
+    """
+    token_list = list(tokens)
+    if lineage_candidates is None:
+        lineage_candidates = [(i, t) for i, t in enumerate(token_list) if classify_token(t) == "lineage_family"]
+    lineage: Optional[str] = None
+    warnings: list[str] = []
+
+    # Tail heuristic first: strong thematic hints near the tail (last ~8 tokens) take precedence
+    tail = token_list[-8:] if len(token_list) >= 8 else token_list
+    tail_set = set(tail)
+    rat_strong = any(t in tail_set for t in RAT_STRONG)
+    rat_sub = any(('rat' in t) for t in tail)
+    # Count weak rat cues allowing substring matches for select morphemes
+    # to catch names like "darktail" and "gnawnine" that often appear as single tokens.
+    def _has_weak_sub(t: str) -> bool:
+        # require meaningful substrings to reduce false positives like "detail";
+        # trim trailing punctuation when checking suffixes
+        t2 = re.sub(r"[^a-z0-9]+$", "", t)
+        return (
+            (t2.endswith('tail') or t2.endswith('tails')) or
+            ('gnaw' in t2) or ('scratch' in t2) or ('whisk' in t2) or ('fang' in t2) or ('claw' in t2)
+        )
+    rat_weak_count = sum(1 for t in tail if (t in RAT_WEAK) or _has_weak_sub(t))
+    # Adjacent-pair detection: if two adjacent tail tokens together form a strong rat cue
+    # (e.g., "gnawnine" next to "darktail"), prefer ratfolk.
+    rat_adjacent_pair = False
+    if len(tail) >= 2:
+        for i in range(len(tail)-1):
+            a, b = tail[i], tail[i+1]
+            if (_has_weak_sub(a) and _has_weak_sub(b)) or ((a in RAT_WEAK) and _has_weak_sub(b)) or (_has_weak_sub(a) and (b in RAT_WEAK)):
+                rat_adjacent_pair = True
+                break
+    undead_hit = any(t in tail_set for t in UNDEAD_HINTS)
+    # Prefer ratfolk when strong or adjacent weak cues exist near the tail.
+    # Adjacent weak-pair is decisive even if generic undead words appear elsewhere in the path.
+    if (rat_strong or rat_sub or rat_adjacent_pair):
+        lineage = "ratfolk"
+    elif not rat_strong and not rat_sub and rat_weak_count >= 2:
+        # multiple weak cues plus a 'rat' token somewhere else in the path
+        # previously required a separate 'rat' substring elsewhere; relax to allow tail-driven pairs
+        lineage = "ratfolk"
+    elif undead_hit and not (rat_strong or rat_sub or rat_adjacent_pair):
+        lineage = "undead"
+
+    # After scanning tokens, if we saw lineage candidates, prefer the deepest
+    # one (largest positional index). This biases towards folder names closer
+    # to the actual model files or the filename itself, which are typically
+    # more specific than generic top-level collection labels.
+    if not lineage and lineage_candidates:
+        # Apply context-based suppression for ambiguous 'ork' usage like
+        # "primaris killing ork" (Ork is object). If Space Marine hints are
+        # present, or an action verb immediately precedes the 'ork' token, do
+        # not assign 'ork' unless we also have Ork-specific subject hints.
+        token_set = set(token_list)
+        filtered_candidates: list[tuple[int, str]] = []
+        suppressed = False
+        for idx, tok in lineage_candidates:
+            if tok in ORX_EQUIV:
+                has_sm_context = any(h in token_set for h in SPACE_MARINE_HINTS)
+                local_prev = {token_list[i] for i in range(max(0, idx-2), idx)}
+                has_action_context = any(v in local_prev for v in ACTION_VERBS)
+                has_ork_support = any(h in token_set for h in ORK_SUBJECT_HINTS)
+                if (has_sm_context or has_action_context) and not has_ork_support:
+                    suppressed = True
+                    continue
+            filtered_candidates.append((idx, tok))
+        # Replace candidates with filtered list; if suppression removed all
+        # candidates, leave the list empty to avoid assigning a misleading
+        # lineage from fallback.
+        if filtered_candidates:
+            lineage_candidates = filtered_candidates
+        elif suppressed:
+            lineage_candidates = []
+        if suppressed:
+            warnings.append("lineage_ambiguous_vs_context")
+        # If multiple candidates, choose the deepest (largest index)
+        if len(lineage_candidates) > 1:
+            _, chosen = max(lineage_candidates, key=lambda it: it[0])
+            lineage = chosen
+        elif len(lineage_candidates) == 1:
+            idx, only_tok = lineage_candidates[0]
+            # Heuristic: if the only lineage token is very early in the token
+            # sequence (likely from a top-level umbrella folder), and there are
+            # many tokens overall, treat this as weak evidence and avoid
+            # assignment to reduce false positives such as
+            #   "goblin mayhem and holy angels/.../actual_non_goblin_files.stl"
+            many_tokens = len(token_list) >= 8
+            if idx <= 2 and many_tokens:
+                warnings.append("lineage_weak_top_level")
+            else:
+                lineage = only_tok
+            # else: no candidates remain; leave lineage unset with warnings
+
+
+    return lineage, warnings
+
+
 def classify_tokens(tokens: Iterable[str], designer_map: dict[str, str], franchise_map: dict[str, str] | None = None, character_map: dict[str, str] | None = None,
                     intended_use_map: Optional[Dict[str, set]] = None, general_faction_map: Optional[Dict[str, set]] = None,
                     designer_phrases: Optional[list[tuple[list[str], str]]] = None):
@@ -821,23 +927,16 @@ def classify_tokens(tokens: Iterable[str], designer_map: dict[str, str], franchi
             if "character_without_context" not in inferred["normalization_warnings"]:
                 inferred["normalization_warnings"].append("character_without_context")
             continue
-        # Scale detection
-        m = SCALE_RATIO_RE.match(tok)
-        if m and not inferred["scale_ratio_den"]:
-            try:
-                den = int(m.group(1))
-                inferred["scale_ratio_den"] = den
-            except Exception:
-                pass
-            continue
-        m2 = SCALE_MM_RE.match(tok)
-        if m2 and not inferred["height_mm"]:
-            try:
-                mm = int(m2.group(1))
-                inferred["height_mm"] = mm
-            except Exception:
-                pass
-            continue
+        # Scale detection: one fused match for both 1:N ratio and NNmm height tokens
+        m = SCALE_TOKEN_RE.match(tok)
+        if m:
+            if m.lastgroup == "scale_ratio":
+                if not inferred["scale_ratio_den"]:
+                    inferred["scale_ratio_den"] = int(m["scale_ratio"])
+                    continue
+            elif not inferred["height_mm"]:
+                inferred["height_mm"] = int(m["scale_mm"])
+                continue
         # Role heuristics for pc candidate
         if tok in ROLE_POSITIVE and tok not in ROLE_NEGATIVE:
             inferred["pc_candidate_flag"] = True
@@ -923,17 +1022,14 @@ def classify_tokens(tokens: Iterable[str], designer_map: dict[str, str], franchi
     # Secondary scale detection pass: handle split tokens like
     # "1-6 scale" -> ["1", "6", "scale"] and "1-6scale" -> ["1", "6scale"].
     # Only run if not already detected by direct token matches.
-    if not inferred.get("scale_ratio_den"):
+    # Every pattern below needs a token containing "scale", so one substring scan over the
+    # joined tokens (a space cannot occur inside "scale") skips the index walks for most paths.
+    if not inferred.get("scale_ratio_den") and "scale" in " ".join(token_list):
         n = len(token_list)
         # Helper to parse a denominator from a token like "6" or "6scale"
         def _parse_den_from_token(t: str) -> Optional[int]:
-            m = re.match(r"^([0-9]{1,3})(?:scale)?$", t)
-            if not m:
-                return None
-            try:
-                return int(m.group(1))
-            except Exception:
-                return None
+            m = _SPLIT_DEN_RE.match(t)
+            return int(m.group(1)) if m else None
 
         # Pattern A: 1, <den>[scale]? [, 'scale'] (requires presence of '1' token, often removed by tokenizer; best effort)
         for i in range(0, n - 1):
@@ -955,7 +1051,7 @@ def classify_tokens(tokens: Iterable[str], designer_map: dict[str, str], franchi
                 if token_list[i] == "scale":
                     # Prefer two- or three-digit neighbor as denominator
                     neighbor = token_list[i + 1] if (i + 1) < n else None
-                    if neighbor and re.fullmatch(r"[0-9]{2,3}", neighbor):
+                    if neighbor and _DEN_DIGITS_RE.fullmatch(neighbor):
                         den = int(neighbor)
                         if den in ALLOWED_DENOMS or den in {5, 8, 11}:
                             inferred["scale_ratio_den"] = den
@@ -963,7 +1059,7 @@ def classify_tokens(tokens: Iterable[str], designer_map: dict[str, str], franchi
                     # Consider '1' then two/three-digit as well
                     if (i + 2) < n and token_list[i + 1] == "1":
                         neighbor2 = token_list[i + 2]
-                        if neighbor2 and re.fullmatch(r"[0-9]{2,3}", neighbor2):
+                        if neighbor2 and _DEN_DIGITS_RE.fullmatch(neighbor2):
                             den = int(neighbor2)
                             if den in ALLOWED_DENOMS or den in {5, 8, 11}:
                                 inferred["scale_ratio_den"] = den
@@ -972,106 +1068,19 @@ def classify_tokens(tokens: Iterable[str], designer_map: dict[str, str], franchi
         # Pattern C: standalone '<den>scale' token (e.g., '6scale', '9scale')
         if not inferred.get("scale_ratio_den"):
             for t in token_list:
-                m = re.fullmatch(r"([0-9]{1,3})scale", t)
+                m = _DEN_SCALE_RE.fullmatch(t)
                 if m:
-                    try:
-                        den = int(m.group(1))
-                    except Exception:
-                        den = None
+                    den = int(m.group(1))
                     if den and (den in ALLOWED_DENOMS or den in {5, 8, 11}):
                         inferred["scale_ratio_den"] = den
                         break
 
-    # Heuristic: if no explicit lineage was found, use strong thematic hints near the tail (last ~8 tokens)
-    if not inferred["lineage_family"]:
-        tail = token_list[-8:] if len(token_list) >= 8 else token_list
-        tail_set = set(tail)
-        rat_strong = any(t in tail_set for t in RAT_STRONG)
-        rat_sub = any(('rat' in t) for t in tail)
-        # Count weak rat cues allowing substring matches for select morphemes
-        # to catch names like "darktail" and "gnawnine" that often appear as single tokens.
-        def _has_weak_sub(t: str) -> bool:
-            # require meaningful substrings to reduce false positives like "detail";
-            # trim trailing punctuation when checking suffixes
-            t2 = re.sub(r"[^a-z0-9]+$", "", t)
-            return (
-                (t2.endswith('tail') or t2.endswith('tails')) or
-                ('gnaw' in t2) or ('scratch' in t2) or ('whisk' in t2) or ('fang' in t2) or ('claw' in t2)
-            )
-        rat_weak_count = sum(1 for t in tail if (t in RAT_WEAK) or _has_weak_sub(t))
-        # Adjacent-pair detection: if two adjacent tail tokens together form a strong rat cue
-        # (e.g., "gnawnine" next to "darktail"), prefer ratfolk.
-        rat_adjacent_pair = False
-        if len(tail) >= 2:
-            for i in range(len(tail)-1):
-                a, b = tail[i], tail[i+1]
-                if (_has_weak_sub(a) and _has_weak_sub(b)) or ((a in RAT_WEAK) and _has_weak_sub(b)) or (_has_weak_sub(a) and (b in RAT_WEAK)):
-                    rat_adjacent_pair = True
-                    break
-        undead_hit = any(t in tail_set for t in UNDEAD_HINTS)
-        # Prefer ratfolk when strong or adjacent weak cues exist near the tail.
-        # Adjacent weak-pair is decisive even if generic undead words appear elsewhere in the path.
-        if (rat_strong or rat_sub or rat_adjacent_pair):
-            inferred["lineage_family"] = "ratfolk"
-        elif not rat_strong and not rat_sub and rat_weak_count >= 2:
-            # multiple weak cues plus a 'rat' token somewhere else in the path
-            # previously required a separate 'rat' substring elsewhere; relax to allow tail-driven pairs
-            inferred["lineage_family"] = "ratfolk"
-        elif undead_hit and not (rat_strong or rat_sub or rat_adjacent_pair):
-            inferred["lineage_family"] = "undead"
-
-    # After scanning tokens, if we saw lineage candidates, prefer the deepest
-    # one (largest positional index). This biases towards folder names closer
-    # to the actual model files or the filename itself, which are typically
-    # more specific than generic top-level collection labels.
-    if not inferred["lineage_family"] and lineage_candidates:
-        # Apply context-based suppression for ambiguous 'ork' usage like
-        # "primaris killing ork" (Ork is object). If Space Marine hints are
-        # present, or an action verb immediately precedes the 'ork' token, do
-        # not assign 'ork' unless we also have Ork-specific subject hints.
-        token_set = set(token_list)
-        filtered_candidates: list[tuple[int, str]] = []
-        suppressed = False
-        for idx, tok in lineage_candidates:
-            if tok in ORX_EQUIV:
-                has_sm_context = any(h in token_set for h in SPACE_MARINE_HINTS)
-                local_prev = {token_list[i] for i in range(max(0, idx-2), idx)}
-                has_action_context = any(v in local_prev for v in ACTION_VERBS)
-                has_ork_support = any(h in token_set for h in ORK_SUBJECT_HINTS)
-                if (has_sm_context or has_action_context) and not has_ork_support:
-                    suppressed = True
-                    continue
-            filtered_candidates.append((idx, tok))
-        # Replace candidates with filtered list; if suppression removed all
-        # candidates, leave the list empty to avoid assigning a misleading
-        # lineage from fallback.
-        if filtered_candidates:
-            lineage_candidates = filtered_candidates
-        elif suppressed:
-            lineage_candidates = []
-        if suppressed:
-            inferred.setdefault("normalization_warnings", [])
-            if "lineage_ambiguous_vs_context" not in inferred["normalization_warnings"]:
-                inferred["normalization_warnings"].append("lineage_ambiguous_vs_context")
-        # If multiple candidates, choose the deepest (largest index)
-        if len(lineage_candidates) > 1:
-            _, chosen = max(lineage_candidates, key=lambda it: it[0])
-            inferred["lineage_family"] = chosen
-        elif len(lineage_candidates) == 1:
-            idx, only_tok = lineage_candidates[0]
-            # Heuristic: if the only lineage token is very early in the token
-            # sequence (likely from a top-level umbrella folder), and there are
-            # many tokens overall, treat this as weak evidence and avoid
-            # assignment to reduce false positives such as
-            #   "goblin mayhem and holy angels/.../actual_non_goblin_files.stl"
-            many_tokens = len(token_list) >= 8
-            if idx <= 2 and many_tokens:
-                inferred.setdefault("normalization_warnings", [])
-                if "lineage_weak_top_level" not in inferred["normalization_warnings"]:
-                    inferred["normalization_warnings"].append("lineage_weak_top_level")
-            else:
-                inferred["lineage_family"] = only_tok
-            # else: no candidates remain; leave lineage unset with warnings
+    lineage, lineage_warnings = resolve_lineage(token_list, lineage_candidates)
+    inferred["lineage_family"] = lineage
+    for w in lineage_warnings:
+        inferred.setdefault("normalization_warnings", [])
+        if w not in inferred["normalization_warnings"]:
+            inferred["normalization_warnings"].append(w)
 
     return inferred
 
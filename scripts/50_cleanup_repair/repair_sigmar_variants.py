@@ -20,8 +20,11 @@ def process(ids, apply: bool):
 
     changed = []
     with get_session() as session:
+        # One SELECT for all targets instead of a lookup per id
+        rows = session.query(Variant).filter(Variant.id.in_(ids)).all()
+        by_id = {v.id: v for v in rows}
         for vid in ids:
-            v = session.query(Variant).filter_by(id=vid).one_or_none()
+            v = by_id.get(vid)
             if not v:
                 print(f"Variant {vid} not found; skipping")
                 continue
@@ -45,11 +48,13 @@ def process(ids, apply: bool):
                     if "franchise_corrected_manual" not in curw:
                         curw = list(curw) + ["franchise_corrected_manual"]
                     v.normalization_warnings = curw
-                    session.commit()
-                    print(f"Applied fix to Variant {vid}")
                     changed.append(vid)
             else:
                 print(f"Variant {vid} already appears correct; skipping")
+        if changed:
+            session.commit()
+            for vid in changed:
+                print(f"Applied fix to Variant {vid}")
 
     print(f"Done. Applied to {len(changed)} variants.")
 
@@ -2,66 +2,78 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Any, Dict
 
-from sqlalchemy import create_engine, text
-
-
-def db_counts(db_url: str, systems: list[str]) -> Dict[str, Dict[str, int]]:
-    eng = create_engine(db_url, future=True)
-    out: Dict[str, Dict[str, int]] = {}
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Engine
+
+from db.session import get_engine
+
+# One grouped aggregate per table (the number of queries does not grow with the number of systems)
+_COUNT_QUERIES: dict[str, str] = {
+    "units": "SELECT gs.key, COUNT(*) FROM unit u JOIN game_system gs ON gs.id = u.system_id WHERE gs.key IN :keys GROUP BY gs.key",
+    "factions": "SELECT gs.key, COUNT(*) FROM faction f JOIN game_system gs ON gs.id = f.system_id WHERE gs.key IN :keys GROUP BY gs.key",
+    "unit_aliases": """
+        SELECT gs.key, COUNT(*) FROM unit_alias ua
+        JOIN unit u ON u.id = ua.unit_id
+        JOIN game_system gs ON gs.id = u.system_id
+        WHERE gs.key IN :keys GROUP BY gs.key
+    """,
+    "parts": "SELECT gs.key, COUNT(*) FROM part p JOIN game_system gs ON gs.id = p.system_id WHERE gs.key IN :keys GROUP BY gs.key",
+    "part_aliases": """
+        SELECT gs.key, COUNT(*) FROM part_alias pa
+        JOIN part p ON p.id = pa.part_id
+        JOIN game_system gs ON gs.id = p.system_id
+        WHERE gs.key IN :keys GROUP BY gs.key
+    """,
+}
+
+
+def db_counts(db_url: str, systems: list[str], engine: Engine | None = None) -> Dict[str, Dict[str, int]]:
+    eng = engine if engine is not None else get_engine(db_url)
+    out: Dict[str, Dict[str, int]] = {skey: dict.fromkeys(_COUNT_QUERIES, 0) for skey in systems}
+    if not systems:
+        return out
+    keys = sorted(set(systems))
     with eng.connect() as c:
-        for skey in systems:
-            unit_cnt = c.execute(
-                text("SELECT COUNT(*) FROM unit WHERE system_id = (SELECT id FROM game_system WHERE key = :k)"),
-                {"k": skey},
-            ).scalar_one_or_none() or 0
-            faction_cnt = c.execute(
-                text("SELECT COUNT(*) FROM faction WHERE system_id = (SELECT id FROM game_system WHERE key = :k)"),
-                {"k": skey},
-            ).scalar_one_or_none() or 0
-            unit_alias_cnt = c.execute(
-                text(
-                    """
-                    SELECT COUNT(*) FROM unit_alias
-                    WHERE unit_id IN (SELECT id FROM unit WHERE system_id = (SELECT id FROM game_system WHERE key = :k))
-                    """
-                ),
-                {"k": skey},
-            ).scalar_one_or_none() or 0
-            part_cnt = c.execute(
-                text("SELECT COUNT(*) FROM part WHERE system_id = (SELECT id FROM game_system WHERE key = :k)"),
-                {"k": skey},
-            ).scalar_one_or_none() or 0
-            part_alias_cnt = c.execute(
-                text(
-                    """
-                    SELECT COUNT(*) FROM part_alias
-                    WHERE part_id IN (SELECT id FROM part WHERE system_id = (SELECT id FROM game_system WHERE key = :k))
-                    """
-                ),
-                {"k": skey},
-            ).scalar_one_or_none() or 0
-
-            out[skey] = {
-                "units": int(unit_cnt),
-                "factions": int(faction_cnt),
-                "unit_aliases": int(unit_alias_cnt),
-                "parts": int(part_cnt),
-                "part_aliases": int(part_alias_cnt),
-            }
+        for field, sql in _COUNT_QUERIES.items():
+            stmt = text(sql).bindparams(bindparam("keys", expanding=True))
+            for skey, cnt in c.execute(stmt, {"keys": keys}):
+                out[skey][field] = int(cnt or 0)
     return out
 
 
 def _load_yaml(path: Path) -> Any:
-    from ruamel.yaml import YAML  # lazy import
-
-    y = YAML(typ="rt")
-    y.preserve_quotes = True
-    y.allow_duplicate_keys = True
-    with path.open("r", encoding="utf-8") as f:
+    # Keyed on mtime so repeated calls in one process reuse the parse until the file changes.
+    # Callers only read the result, so the cached object is shared as-is.
+    return _load_yaml_cached(str(path), path.stat().st_mtime_ns)
+
+
+@functools.cache
+def _load_yaml_cached(path_str: str, mtime_ns: int) -> Any:
+    # Prefer PyYAML's libyaml-backed CSafeLoader when installed (roughly 10x faster on the codex files);
+    # PyYAML is optional, so fall back to ruamel's safe loader. On duplicate keys PyYAML keeps the last
+    # value and ruamel the first, which does not change any count below.
+    try:
+        import yaml  # type: ignore
+
+        has_libyaml = bool(yaml.__with_libyaml__)
+    except ImportError:
+        has_libyaml = False
+    with open(path_str, encoding="utf-8") as f:
+        if has_libyaml:
+            return yaml.load(f, Loader=yaml.CSafeLoader)
+        from ruamel.yaml import YAML  # lazy import
+
+        # Counting only: the safe loader skips round-trip comment/quote preservation
+        y = YAML(typ="safe")
+        y.allow_duplicate_keys = True
         return y.load(f)
 
 
@@ -73,65 +85,102 @@ def _count_entries(val: Any) -> int:
     return 0
 
 
-def yaml_expected_counts(vocab_dir: Path) -> Dict[str, Dict[str, int]]:
+_AOS_FACTION_SECTIONS = ("endless_spells", "manifestations", "invocations", "warscroll_terrain")
+_AOS_SHARED_SECTIONS = (
+    "shared_endless_spells",
+    "regiments_of_renown",
+    "shared_manifestations",
+    "shared_invocations",
+    "shared_terrain",
+)
+
+
+def _count_aos_units(root: Any) -> int:
+    """Approximate AoS count: unit_types entries and special sections per faction, plus shared sections.
+
+    Nodes of an unexpected shape are skipped individually (one isinstance check each) instead of a
+    blanket try/except that silently dropped everything after the first malformed node.
+    """
+    if not isinstance(root, dict):
+        return 0
+    total = 0
+    grand_alliances = root.get("grand_alliances")
+    for ga_node in grand_alliances.values() if isinstance(grand_alliances, dict) else ():
+        factions = ga_node.get("factions") if isinstance(ga_node, dict) else None
+        if not isinstance(factions, dict):
+            continue
+        for fac_node in factions.values():
+            if not isinstance(fac_node, dict):
+                continue
+            unit_types = fac_node.get("unit_types")
+            if isinstance(unit_types, dict):
+                total += sum(len(entries) for entries in unit_types.values() if isinstance(entries, (dict, list)))
+            total += sum(_count_entries(fac_node.get(sect)) for sect in _AOS_FACTION_SECTIONS)
+    total += sum(_count_entries(root.get(sect)) for sect in _AOS_SHARED_SECTIONS)
+    return total
+
+
+def _count_codex_units(data: Any, system: str) -> int:
+    root = (data or {}).get("codex_units", {}).get(system, {})
+    units = (root or {}).get("units", {})
+    return sum(1 for k, v in (units or {}).items() if isinstance(v, dict))
+
+
+def _count_w40k_units(data: Any) -> int:
+    return _count_codex_units(data, "warhammer_40k")
+
+
+def _count_heresy_units(data: Any) -> int:
+    return _count_codex_units(data, "warhammer_30k")
+
+
+def _count_wargear(data: Any) -> int:
+    return _count_entries((data or {}).get("wargear", {}))
+
+
+def _count_bodies(data: Any) -> int:
+    return _count_entries((data or {}).get("bodies", {}))
+
+
+def _count_aos_yaml(data: Any) -> int:
+    return _count_aos_units((data or {}).get("codex_units", {}).get("age_of_sigmar", {}))
+
+
+# (system, field, YAML file under vocab_dir, counter) in report order
+_YAML_COUNTS = (
+    ("w40k", "units_yaml", "codex_units_w40k.yaml", _count_w40k_units),
+    ("w40k", "wargear_yaml", "wargear_w40k.yaml", _count_wargear),
+    ("w40k", "bodies_yaml", "bodies_w40k.yaml", _count_bodies),
+    ("heresy", "units_yaml", "codex_units_horus_heresy.yaml", _count_heresy_units),
+    ("aos", "units_yaml_approx", "codex_units_aos.yaml", _count_aos_yaml),
+)
+
+# Below this much YAML in total, process start-up costs more than parsing the files serially
+_PARALLEL_MIN_BYTES = 256 * 1024
+
+
+def _load_and_count(path_str: str, counter) -> int:
+    # Module-level so it can be sent to worker processes; only the count comes back, not the parsed tree
+    return counter(_load_yaml(Path(path_str)))
+
+
+def yaml_expected_counts(vocab_dir: Path, parallel: bool = True) -> Dict[str, Dict[str, int]]:
     out: Dict[str, Dict[str, int]] = {"w40k": {}, "aos": {}, "heresy": {}, "old_world": {}}
 
-    w40k_path = vocab_dir / "codex_units_w40k.yaml"
-    if w40k_path.exists():
-        data = _load_yaml(w40k_path)
-        root = (data or {}).get("codex_units", {}).get("warhammer_40k", {})
-        units = (root or {}).get("units", {})
-        out["w40k"]["units_yaml"] = sum(1 for k, v in (units or {}).items() if isinstance(v, dict))
-
-    wg_path = vocab_dir / "wargear_w40k.yaml"
-    if wg_path.exists():
-        data = _load_yaml(wg_path)
-        wargear = (data or {}).get("wargear", {})
-        out["w40k"]["wargear_yaml"] = _count_entries(wargear)
-
-    bodies_path = vocab_dir / "bodies_w40k.yaml"
-    if bodies_path.exists():
-        data = _load_yaml(bodies_path)
-        bodies = (data or {}).get("bodies", {})
-        out["w40k"]["bodies_yaml"] = _count_entries(bodies)
-
-    hh_path = vocab_dir / "codex_units_horus_heresy.yaml"
-    if hh_path.exists():
-        data = _load_yaml(hh_path)
-        root = (data or {}).get("codex_units", {}).get("warhammer_30k", {})
-        units = (root or {}).get("units", {})
-        out["heresy"]["units_yaml"] = sum(1 for k, v in (units or {}).items() if isinstance(v, dict))
-
-    aos_path = vocab_dir / "codex_units_aos.yaml"
-    if aos_path.exists():
-        data = _load_yaml(aos_path)
-        root = (data or {}).get("codex_units", {}).get("age_of_sigmar", {})
-        total = 0
+    items = [(sk, field, vocab_dir / name, counter) for sk, field, name, counter in _YAML_COUNTS if (vocab_dir / name).exists()]
+    counts: list[int] | None = None
+    cpus = os.cpu_count() or 1
+    # The files are independent: parse them in separate processes when there are several sizeable ones
+    if parallel and len(items) > 1 and cpus > 1 and sum(p.stat().st_size for _, _, p, _ in items) > _PARALLEL_MIN_BYTES:
         try:
-            ga = (root or {}).get("grand_alliances", {})
-            for ga_name, ga_node in (ga or {}).items():
-                factions = (ga_node or {}).get("factions", {})
-                for fac_key, fac_node in (factions or {}).items():
-                    ut = (fac_node or {}).get("unit_types", {})
-                    for utype, entries in (ut or {}).items():
-                        if isinstance(entries, dict):
-                            total += len(entries)
-                        elif isinstance(entries, list):
-                            total += len(entries)
-                    for sect in ["endless_spells", "manifestations", "invocations", "warscroll_terrain"]:
-                        total += _count_entries((fac_node or {}).get(sect))
-            for sect in [
-                "shared_endless_spells",
-                "regiments_of_renown",
-                "shared_manifestations",
-                "shared_invocations",
-                "shared_terrain",
-            ]:
-                total += _count_entries((root or {}).get(sect))
-        except Exception:
-            pass
-        out["aos"]["units_yaml_approx"] = total
-
+            with ProcessPoolExecutor(max_workers=min(len(items), cpus)) as ex:
+                counts = list(ex.map(_load_and_count, [str(p) for _, _, p, _ in items], [c for _, _, _, c in items]))
+        except (OSError, pickle.PicklingError, BrokenProcessPool) as e:
+            print(f"[warn] parallel YAML load failed ({e}); loading serially")
+    if counts is None:
+        counts = [counter(_load_yaml(p)) for _, _, p, counter in items]
+    for (sk, field, _, _), n in zip(items, counts):
+        out[sk][field] = n
     return out
 
 
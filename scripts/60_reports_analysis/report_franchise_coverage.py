@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import sys
 
+from sqlalchemy import exists
+
 from db.models import Variant, VocabEntry
 from db.session import get_session
 
@@ -15,13 +17,15 @@ from db.session import get_session
 def main(argv: list[str] | None = None) -> int:
     out_lines = ["variant_id\trel_path\tfranchise\tvocab_exists"]
     with get_session() as session:
-        rows = session.query(Variant).filter(Variant.franchise.isnot(None)).all()
-        vrows = session.query(VocabEntry).filter_by(domain='franchise').all()
-        existing = {v.key for v in vrows}
-        for v in rows:
+        # Only the printed columns are selected (plain rows, no ORM instances); the vocab check is a correlated
+        # EXISTS so the database answers it per row instead of a Python-side set of every franchise key
+        has_vocab = exists().where(VocabEntry.domain == 'franchise', VocabEntry.key == Variant.franchise)
+        rows = session.query(Variant.id, Variant.rel_path, Variant.franchise, has_vocab.label('vocab_exists'))
+        rows = rows.filter(Variant.franchise.isnot(None))
+        for v in rows.yield_per(1000):
             key = v.franchise or ""
-            exists = 'yes' if key in existing else 'no'
-            out_lines.append(f"{v.id}\t{v.rel_path}\t{key}\t{exists}")
+            exists_flag = 'yes' if v.vocab_exists else 'no'
+            out_lines.append(f"{v.id}\t{v.rel_path}\t{key}\t{exists_flag}")
 
     print('\n'.join(out_lines))
     return 0
@@ -12,12 +12,15 @@ from db.session import get_session
 
 def main(argv: list[str] | None = None) -> int:
     with get_session() as s:
-        total = s.query(func.count(Variant.id)).scalar()
-        token_version_set = s.query(func.count(Variant.id)).filter(Variant.token_version.isnot(None)).scalar()
-        designer_set = s.query(func.count(Variant.id)).filter(Variant.designer.isnot(None)).scalar()
-        franchise_set = s.query(func.count(Variant.id)).filter(Variant.franchise.isnot(None)).scalar()
-        residual_set = s.query(func.count(Variant.id)).filter(Variant.residual_tokens != None).scalar()  # noqa: E711
-        content_set = s.query(func.count(Variant.id)).filter(Variant.content_flag.isnot(None)).scalar()
+        # All six counts in one table scan: COUNT(column) counts the rows where that column is not NULL
+        total, token_version_set, designer_set, franchise_set, residual_set, content_set = s.query(
+            func.count(Variant.id),
+            func.count(Variant.token_version),
+            func.count(Variant.designer),
+            func.count(Variant.franchise),
+            func.count(Variant.residual_tokens),
+            func.count(Variant.content_flag),
+        ).one()
         print('total_variants:', total)
         print('token_version_set:', token_version_set)
         print('designer_set:', designer_set)
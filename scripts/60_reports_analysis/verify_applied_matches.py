@@ -17,21 +17,9 @@ def _load_json_with_trailer(path: Path) -> dict:
         start = raw.find('{')
         if start == -1:
             raise ValueError('No JSON object found in file')
-        depth = 0
-        end = None
-        for i in range(start, len(raw)):
-            ch = raw[i]
-            if ch == '{':
-                depth += 1
-            elif ch == '}':
-                depth -= 1
-                if depth == 0:
-                    end = i + 1
-                    break
-        if end is None:
-            raise ValueError('Could not find end of JSON object in file')
-        snippet = raw[start:end]
-        return json.loads(snippet)
+        # raw_decode parses the first complete object in C and ignores the trailing log text
+        obj, _ = json.JSONDecoder().raw_decode(raw, start)
+        return obj
 
 
 def main(argv: list[str] | None = None) -> int:
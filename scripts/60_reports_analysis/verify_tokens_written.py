@@ -7,7 +7,7 @@ import os
 def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Verify residual_tokens presence for a sample file/variant")
     ap.add_argument("--db-url", help="Database URL (overrides STLMGR_DB_URL)")
-    ap.add_argument("--like", default="%Ryuko%", help="SQL LIKE pattern to search in File.rel_path (default: %Ryuko%)")
+    ap.add_argument("--like", default="%Ryuko%", help="Case-insensitive SQL LIKE pattern to search in File.rel_path (default: %Ryuko%)")
     args = ap.parse_args(argv)
 
     if args.db_url:
@@ -16,25 +16,26 @@ def main(argv: list[str] | None = None) -> int:
     from db.models import File, Variant
     from db.session import get_session  # late import to honor --db-url
 
+    # One round-trip per lookup: project just the columns we print, joined to the owning variant
+    cols = (File.id, File.rel_path, File.residual_tokens, Variant.residual_tokens)
     with get_session() as s:
-        f = s.query(File).filter(File.rel_path.like(args.like)).first()
-        if f:
-            print("Found file:", f.id)
-            print("rel_path:", f.rel_path)
-            print("file residual_tokens sample:", (f.residual_tokens or [])[:20])
-            v = s.query(Variant).get(f.variant_id)
-            print("variant residual_tokens sample:", (v.residual_tokens or [])[:20])
+        row = s.query(*cols).join(Variant, Variant.id == File.variant_id).filter(File.rel_path.ilike(args.like)).first()
+        if row:
+            file_id, rel_path, file_tokens, variant_tokens = row
+            print("Found file:", file_id)
+            print("rel_path:", rel_path)
+            print("file residual_tokens sample:", (file_tokens or [])[:20])
+            print("variant residual_tokens sample:", (variant_tokens or [])[:20])
         else:
             print("No matching file found; printing sample file id=1 tokens")
-            f2 = s.query(File).get(1)
-            if not f2:
+            row = s.query(*cols).join(Variant, Variant.id == File.variant_id).filter(File.id == 1).first()
+            if not row:
                 print("No file with id=1 found.")
                 return 2
-            print("File 1 rel_path:", f2.rel_path)
-            print("File 1 residual_tokens:", (f2.residual_tokens or [])[:40])
-            v2 = s.query(Variant).get(f2.variant_id)
-            if v2:
-                print("Variant 1 residual_tokens:", (v2.residual_tokens or [])[:40])
+            _, rel_path, file_tokens, variant_tokens = row
+            print("File 1 rel_path:", rel_path)
+            print("File 1 residual_tokens:", (file_tokens or [])[:40])
+            print("Variant 1 residual_tokens:", (variant_tokens or [])[:40])
     return 0
 
 
@@ -30,20 +30,17 @@ def rebind_db(db_url: str | None) -> None:
 
 def show(ids: list[int]):
     with get_session() as session:
+        # One SELECT for every requested id; output still follows the order given on the command line
+        rows = session.query(Variant).filter(Variant.id.in_(ids)).all()
+        by_id = {v.id: v for v in rows}
         for vid in ids:
-            v = session.query(Variant).get(vid)
+            v = by_id.get(vid)
             if not v:
                 print(f"Variant id={vid} not found")
                 continue
             raw = {c.name: getattr(v, c.name) for c in v.__table__.columns}
-            data = {}
-            for k, val in raw.items():
-                try:
-                    json.dumps(val)
-                    data[k] = val
-                except Exception:
-                    data[k] = str(val)
-            print(json.dumps({"variant_id": vid, "data": data}, indent=2, ensure_ascii=False))
+            # default=str renders datetimes and other non-JSON values without a trial dumps per column
+            print(json.dumps({"variant_id": vid, "data": raw}, indent=2, ensure_ascii=False, default=str))
 
 
 def main(argv: list[str] | None = None) -> int:
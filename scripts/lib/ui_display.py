@@ -29,7 +29,7 @@ def _get_translate_tokens():
 # Constants
 # ---------------------------------------------------------------------------
 
-_BANNED_WORDS = {
+_BANNED_WORDS = frozenset({
     # Generic packaging/modifiers
     'supported', 'unsupported', 'presupported', 'pre', 'pre-supported', 'fixed',
     'repair', 'repaired', 'test', 'sample', 'store', 'bundle', 'pack', 'set',
@@ -48,37 +48,45 @@ _BANNED_WORDS = {
     # Generic descriptors that shouldn't headline labels
     'scale', 'uncut', 'cut', 'merged', 'merge', 'split', 'hollow', 'hollowed',
     'solid', 'version', 'pose', 'poses',
-}
+})
 
-_GENERIC_VARIANT_NAMES = {
+_GENERIC_VARIANT_NAMES = frozenset({
     'bodies', 'body', 'heads', 'head', 'arms', 'arm', 'legs', 'leg', 'torsos',
     'torso', 'weapons', 'weapon', 'bits', 'accessories', 'poses', 'pose',
     'helmets', 'helmet', 'cloaks', 'cloak', 'shields', 'shield', 'spears',
     'spear', 'swords', 'sword', 'backpacks', 'backpack', 'hand', 'hands',
     'flamer', 'flamers',
-}
+})
 
-_BUCKET_CONNECTORS = {"and", "&", "with"}
-_BUCKET_PACKAGING = {"presupported", "supported", "unsupported"}
+_BUCKET_CONNECTORS = frozenset({"and", "&", "with"})
+_BUCKET_PACKAGING = frozenset({"presupported", "supported", "unsupported"})
 
-_PACKAGING_SEGMENTS = {
+_PACKAGING_SEGMENTS = frozenset({
     'supported', 'unsupported', 'presupported', 'lys', 'lychee', 'stl', 'stls',
     '32mm', '75mm', '32', '75', 'cg', 'nsfw', 'sfw',
-}
+})
 
-_CONTAINER_SEGMENTS = {
+_CONTAINER_SEGMENTS = frozenset({
     'characters', 'character', 'heroes', 'lone heroes', 'units', 'unit', 'troops',
     'infantry', 'cavalry', 'combined', 'bundle', 'set', 'sets', 'kit', 'kits',
     'folders', 'collection', 'collections', 'misc', 'various', 'others',
     'assortment', 'lone',
-}
+})
 
-_MONTHS = {m.lower() for m in (
+_MONTHS = frozenset(m.lower() for m in (
     'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August',
     'September', 'October', 'November', 'December',
     'Jan', 'Feb', 'Mar', 'Apr', 'Jun', 'Jul', 'Aug', 'Sep', 'Sept', 'Oct',
     'Nov', 'Dec',
-)}
+))
+
+# Derived word sets used by the label helpers (built once here, not per call)
+_ENG_TOKEN_NOISE = _PACKAGING_SEGMENTS | {
+    'freeguild', 'marshal', 'relic', 'envoy', 'general', 'on', 'and', 'the', 'of',
+    'base', 'full', 'square', 'stl', 'supported', 'unsupported',
+}
+_STRIP_NOISE = _PACKAGING_SEGMENTS | {'base', 'full', 'square', 'round', 'oval', 'the', 'of', 'and', 'on', 'by'}
+_NAME_GENERIC_WORDS = _GENERIC_VARIANT_NAMES | _BANNED_WORDS
 
 # ---------------------------------------------------------------------------
 # Low-level helpers
@@ -188,28 +196,19 @@ def _candidate_from_eng_tokens(tokens: Optional[List[str]]) -> str:
         return ''
     words = [str(t).strip().lower() for t in tokens if isinstance(t, str) and str(t).strip()]
     words = _clean_words(words)
-    noise = set().union(
-        _PACKAGING_SEGMENTS,
-        {'freeguild', 'marshal', 'relic', 'envoy', 'general', 'on', 'and', 'the', 'of',
-         'base', 'full', 'square', 'stl', 'supported', 'unsupported'},
-    )
     for w in words:
-        if w not in noise:
+        if w not in _ENG_TOKEN_NOISE:
             return _title_case([w])
     return ''
 
 
 def _strip_noise_tokens(words: List[str]) -> List[str]:
-    noise = set().union(
-        _PACKAGING_SEGMENTS,
-        {'base', 'full', 'square', 'round', 'oval', 'the', 'of', 'and', 'on', 'by'},
-    )
     if words and words[0] == 'the':
-        tail = [w for w in words[1:] if w not in noise]
+        tail = [w for w in words[1:] if w not in _STRIP_NOISE]
         if tail:
             return ['the'] + tail
         return tail
-    return [w for w in words if w not in noise]
+    return [w for w in words if w not in _STRIP_NOISE]
 
 
 def _is_packaging_segment(seg: str) -> bool:
@@ -256,8 +255,7 @@ def _best_named_segment_from_path(relp: str) -> str:
     def looks_like_name(tokens: List[str]) -> bool:
         if not tokens:
             return False
-        generic = set().union(_GENERIC_VARIANT_NAMES, _BANNED_WORDS)
-        return any(t.isalpha() and t not in generic for t in tokens)
+        return any(t.isalpha() and t not in _NAME_GENERIC_WORDS for t in tokens)
 
     def score(seg: str, idx: int) -> int:
         s = seg.strip().lower()
@@ -758,8 +756,7 @@ def build_ui_display(
             if thing:
                 if collection and (_norm_label(thing) == _norm_label(collection)):
                     is_containerish = True
-                cont_keys = set(_CONTAINER_SEGMENTS)
-                if any(t in cont_keys for t in thing_tokens):
+                if any(t in _CONTAINER_SEGMENTS for t in thing_tokens):
                     is_containerish = True
             if bucket:
                 if (not thing) or (_norm_label(thing) == _norm_label(bucket)) or is_containerish:
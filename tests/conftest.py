@@ -1,5 +1,74 @@
 # Global PyTest settings for tests/ directory
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+from typing import Any
+
+import pytest
+from ruamel.yaml import YAML
+from ruamel.yaml.nodes import MappingNode, Node, SequenceNode
+
 # Ignore the legacy multilingual test module to avoid basename import collisions
 collect_ignore = [
     "test_multilingual_backfill.py",
 ]
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CODEX_W40K_PATH = REPO_ROOT / "vocab" / "codex_units_w40k.yaml"
+
+
+def _duplicate_keys(node: Node, path: tuple[str, ...] = ()) -> list[str]:
+    # Dotted paths of mapping keys that repeat within the same mapping, in document order
+    found: list[str] = []
+    if isinstance(node, MappingNode):
+        seen: set[str] = set()
+        for key_node, val_node in node.value:
+            key = str(key_node.value)
+            if key in seen:
+                found.append(".".join((*path, key)))
+            seen.add(key)
+            found.extend(_duplicate_keys(val_node, (*path, key)))
+    elif isinstance(node, SequenceNode):
+        for i, val_node in enumerate(node.value):
+            found.extend(_duplicate_keys(val_node, (*path, str(i))))
+    return found
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_codex(path_str: str, mtime_ns: int) -> tuple[Any, tuple[str, ...]]:
+    # mtime_ns is part of the cache key only, so editing the codex invalidates the cached tree
+    # Stream from the open file so no whole-file str copy is held next to the parsed tree.
+    # Same loader settings as scripts/20_loaders/load_codex_from_yaml.py: ruamel's safe loader
+    # with duplicate keys allowed, where the first definition of a repeated key wins. That keeps
+    # the tests checking exactly what the loader writes to the DB.
+    # Composing the node graph first and constructing from it (what load() does internally) lets
+    # the same single parse also report the repeated keys that construction collapses.
+    y = YAML(typ="safe")
+    y.allow_duplicate_keys = True
+    with open(path_str, encoding="utf-8") as f:
+        node = y.compose(f)
+    return y.constructor.construct_document(node), tuple(_duplicate_keys(node))
+
+
+def _load_codex(path: Path = CODEX_W40K_PATH) -> tuple[Any, tuple[str, ...]]:
+    assert path.exists(), f"Missing codex file: {path}"
+    return _parse_codex(str(path), path.stat().st_mtime_ns)
+
+
+@pytest.fixture(scope="session")
+def codex_w40k() -> Any:
+    """Parsed vocab/codex_units_w40k.yaml, shared by every test in the run (treat as read-only)."""
+    return _load_codex()[0]
+
+
+@pytest.fixture(scope="session")
+def codex_w40k_duplicate_keys() -> tuple[str, ...]:
+    """Dotted paths of keys repeated in vocab/codex_units_w40k.yaml (collapsed in codex_w40k)."""
+    return _load_codex()[1]
+
+
+@pytest.fixture(scope="session")
+def repo_root() -> Path:
+    """Repository root, resolved once when this conftest is imported."""
+    return REPO_ROOT
@@ -10,20 +10,22 @@ Tests cover pure functions that do NOT require a database connection:
 """
 from __future__ import annotations
 
-import importlib.util
 import sys
 import unittest
+from operator import attrgetter, itemgetter
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
 
-# The module lives under a numeric-prefix directory so we import it via spec.
+import pytest
+
+# The module lives under a numeric-prefix directory (not an importable package), so put
+# that directory on sys.path once and import it normally. The regular import system then
+# dedupes via sys.modules and reuses the __pycache__ bytecode instead of recompiling.
 _REPO = Path(__file__).resolve().parents[1]
-_MOD_PATH = _REPO / "scripts" / "30_normalize_match" / "match_variants_to_units.py"
-_spec = importlib.util.spec_from_file_location("match_variants_to_units", str(_MOD_PATH))
-_mod = importlib.util.module_from_spec(_spec)
-# Register in sys.modules BEFORE exec so that @dataclass can resolve __module__
-sys.modules["match_variants_to_units"] = _mod
-_spec.loader.exec_module(_mod)
+_SCRIPT_DIR = str(_REPO / "scripts" / "30_normalize_match")
+if _SCRIPT_DIR not in sys.path:
+    sys.path.append(_SCRIPT_DIR)
+import match_variants_to_units as _mod  # noqa: E402
 
 # Pull out all the symbols we want to test
 norm_text = _mod.norm_text
@@ -56,53 +58,57 @@ def _ref(unit_key: str = "test_unit", system_key: str = "w40k",
     )
 
 
-# ── norm_text ────────────────────────────────────────────────────────────────
-
-
-class TestNormText(unittest.TestCase):
-    def test_basic_lowering_and_collapse(self):
-        self.assertEqual(norm_text("Hello  World"), "hello world")
-
-    def test_warhammer_40k_alias(self):
-        self.assertEqual(norm_text("Warhammer 40,000 Space Marines"), "w40k space marines")
+_first = itemgetter(0)
+_unit_key = attrgetter("unit_key")
 
-    def test_age_of_sigmar_alias(self):
-        self.assertIn("aos", norm_text("Age of Sigmar Nighthaunt"))
 
-    def test_horus_heresy_alias(self):
-        self.assertIn("heresy", norm_text("Horus Heresy Terminators"))
+def _matched_keys(results) -> Set[str]:
+    # unit_key of every (UnitRef, score, via) result, walked with C-level getters
+    return set(map(_unit_key, map(_first, results)))
 
-    def test_30k_alias(self):
-        self.assertIn("heresy", norm_text("30k Solar Auxilia"))
-
-    def test_non_word_collapse(self):
-        self.assertEqual(norm_text("a--b__c//d"), "a b c d")
 
+# ── norm_text ────────────────────────────────────────────────────────────────
 
-# ── system_hint ──────────────────────────────────────────────────────────────
 
+@pytest.mark.parametrize("text,expected", [
+    ("Hello  World", "hello world"),  # lowering and whitespace collapse
+    ("Warhammer 40,000 Space Marines", "w40k space marines"),
+    ("a--b__c//d", "a b c d"),  # non-word collapse
+])
+def test_norm_text_exact(text, expected):
+    assert norm_text(text) == expected
 
-class TestSystemHint(unittest.TestCase):
-    def test_w40k_keywords(self):
-        for text in ["40k Space Marines", "W40K files", "wh40k", "Warhammer 40,000"]:
-            self.assertEqual(system_hint(text), "w40k", msg=text)
 
-    def test_aos_direct_keywords(self):
-        for text in ["aos", "Age of Sigmar", "Sigmar", "Freeguild"]:
-            self.assertEqual(system_hint(text), "aos", msg=text)
+@pytest.mark.parametrize("text,alias", [
+    ("Age of Sigmar Nighthaunt", "aos"),
+    ("Horus Heresy Terminators", "heresy"),
+    ("30k Solar Auxilia", "heresy"),
+])
+def test_norm_text_system_aliases(text, alias):
+    assert alias in norm_text(text)
 
-    def test_aos_faction_tokens(self):
-        self.assertEqual(system_hint("Soulblight Gravelords Vampires"), "aos")
 
-    def test_heresy_keywords(self):
-        for text in ["Heresy era", "30k", "Horus Heresy"]:
-            self.assertEqual(system_hint(text), "heresy", msg=text)
+# ── system_hint ──────────────────────────────────────────────────────────────
 
-    def test_no_hint(self):
-        self.assertIsNone(system_hint("some random STL folder"))
 
-    def test_case_insensitive(self):
-        self.assertEqual(system_hint("AOS stuff"), "aos")
+@pytest.mark.parametrize("text,expected", [
+    ("40k Space Marines", "w40k"),
+    ("W40K files", "w40k"),
+    ("wh40k", "w40k"),
+    ("Warhammer 40,000", "w40k"),
+    ("aos", "aos"),
+    ("Age of Sigmar", "aos"),
+    ("Sigmar", "aos"),
+    ("Freeguild", "aos"),
+    ("Soulblight Gravelords Vampires", "aos"),  # AoS faction tokens imply the system
+    ("AOS stuff", "aos"),  # case-insensitive
+    ("Heresy era", "heresy"),
+    ("30k", "heresy"),
+    ("Horus Heresy", "heresy"),
+    ("some random STL folder", None),
+])
+def test_system_hint(text, expected):
+    assert system_hint(text) == expected
 
 
 # ── find_chapter_hint ────────────────────────────────────────────────────────
@@ -211,25 +217,26 @@ class TestApplyMountBias(unittest.TestCase):
 # ── detect_spell_context ─────────────────────────────────────────────────────
 
 
-class TestDetectSpellContext(unittest.TestCase):
-    def test_positive(self):
-        for text in ["endless spell tokens", "manifestation folder", "invocation of khorne"]:
-            self.assertTrue(detect_spell_context(text), msg=text)
-
-    def test_negative(self):
-        self.assertFalse(detect_spell_context("space marine captain"))
+@pytest.mark.parametrize("text,expected", [
+    ("endless spell tokens", True),
+    ("manifestation folder", True),
+    ("invocation of khorne", True),
+    ("space marine captain", False),
+])
+def test_detect_spell_context(text, expected):
+    assert detect_spell_context(text) is expected
 
 
 # ── detect_aos_faction_hint ──────────────────────────────────────────────────
 
 
-class TestDetectAosFactionHint(unittest.TestCase):
-    def test_known_faction(self):
-        self.assertEqual(detect_aos_faction_hint("stormcast eternals heroes"), "stormcast_eternals")
-        self.assertEqual(detect_aos_faction_hint("nighthaunt grimghast reapers"), "nighthaunt")
-
-    def test_no_match(self):
-        self.assertIsNone(detect_aos_faction_hint("random folder no faction"))
+@pytest.mark.parametrize("text,expected", [
+    ("stormcast eternals heroes", "stormcast_eternals"),
+    ("nighthaunt grimghast reapers", "nighthaunt"),
+    ("random folder no faction", None),
+])
+def test_detect_aos_faction_hint(text, expected):
+    assert detect_aos_faction_hint(text) == expected
 
 
 # ── score_match ──────────────────────────────────────────────────────────────
@@ -303,51 +310,57 @@ class TestPathSegments(unittest.TestCase):
 
 
 class TestFindBestMatches(unittest.TestCase):
-    def _build_index(self, entries: List[Tuple[str, UnitRef]]) -> Dict[str, List[UnitRef]]:
-        from collections import defaultdict
-        idx: Dict[str, List[UnitRef]] = defaultdict(list)
+    @classmethod
+    def _build_index(cls, entries: List[Tuple[str, UnitRef]]) -> Dict[str, Tuple[UnitRef, ...]]:
+        # Write-once fixtures: group per phrase, then freeze each bucket as a tuple
+        idx: Dict[str, List[UnitRef]] = {}
         for phrase, ref in entries:
-            idx[phrase].append(ref)
-        return idx
+            idx.setdefault(phrase, []).append(ref)
+        return {phrase: tuple(refs) for phrase, refs in idx.items()}
+
+    @classmethod
+    def setUpClass(cls):
+        # find_best_matches only reads the index, so build the shared refs/indexes once per class
+        cls.ref_intercessor = _ref(unit_key="intercessor_squad", unit_name="Intercessor Squad")
+        cls.idx_single = cls._build_index([("intercessor squad", cls.ref_intercessor)])
+        cls.idx_short_long = cls._build_index([
+            ("assault squad", _ref(unit_key="assault_squad", unit_name="Assault Squad", unit_id=1)),
+            ("terminator assault squad",
+             _ref(unit_key="terminator_assault_squad", unit_name="Terminator Assault Squad", unit_id=2)),
+        ])
+        cls.idx_ranger_dual = cls._build_index([
+            ("ranger", _ref(unit_key="ranger_40k", system_key="w40k", unit_name="Ranger", unit_id=1)),
+            ("ranger", _ref(unit_key="ranger_aos", system_key="aos", unit_name="Ranger", unit_id=2)),
+        ])
 
     def test_single_match(self):
-        ref = _ref(unit_key="intercessor_squad", unit_name="Intercessor Squad")
-        idx = self._build_index([("intercessor squad", ref)])
-        results = find_best_matches(idx, "intercessor squad space marines", "w40k")
+        results = find_best_matches(self.idx_single, "intercessor squad space marines", "w40k")
         self.assertTrue(len(results) >= 1)
         self.assertEqual(results[0][0].unit_key, "intercessor_squad")
 
     def test_no_match(self):
-        ref = _ref(unit_key="intercessor_squad", unit_name="Intercessor Squad")
-        idx = self._build_index([("intercessor squad", ref)])
-        results = find_best_matches(idx, "some unrelated folder", None)
+        results = find_best_matches(self.idx_single, "some unrelated folder", None, sort=False)
         self.assertEqual(len(results), 0)
 
     def test_longer_phrase_preferred(self):
-        ref_short = _ref(unit_key="assault_squad", unit_name="Assault Squad", unit_id=1)
-        ref_long = _ref(unit_key="terminator_assault_squad", unit_name="Terminator Assault Squad", unit_id=2)
-        idx = self._build_index([
-            ("assault squad", ref_short),
-            ("terminator assault squad", ref_long),
-        ])
-        results = find_best_matches(idx, "terminator assault squad models", "w40k")
+        results = find_best_matches(self.idx_short_long, "terminator assault squad models", "w40k", sort=False)
         # The longer phrase should subsume the shorter one
-        matched_keys = {r[0].unit_key for r in results}
+        matched_keys = _matched_keys(results)
         self.assertIn("terminator_assault_squad", matched_keys)
 
     def test_system_consistency_affects_ranking(self):
-        ref_40k = _ref(unit_key="ranger_40k", system_key="w40k", unit_name="Ranger", unit_id=1)
-        ref_aos = _ref(unit_key="ranger_aos", system_key="aos", unit_name="Ranger", unit_id=2)
-        idx = self._build_index([
-            ("ranger", ref_40k),
-            ("ranger", ref_aos),
-        ])
-        results = find_best_matches(idx, "ranger squad w40k", "w40k")
+        results = find_best_matches(self.idx_ranger_dual, "ranger squad w40k", "w40k", sort=False)
         if len(results) >= 2:
             # 40k ranger should score higher than aos ranger
             scores = {r[0].unit_key: r[1] for r in results}
             self.assertGreater(scores["ranger_40k"], scores["ranger_aos"])
 
+    def test_top_k_matches_sorted_prefix(self):
+        text = "ranger squad w40k"
+        full = find_best_matches(self.idx_ranger_dual, text, "w40k")
+        self.assertEqual(find_best_matches(self.idx_ranger_dual, text, "w40k", top_k=1), full[:1])
+        self.assertEqual(find_best_matches(self.idx_ranger_dual, text, "w40k", top_k=5), full)
+
     def test_mount_injection(self):
         base = _ref(unit_key="vampire_lord", unit_name="Vampire Lord", unit_id=1)
         mounted = _ref(unit_key="vampire_lord_on_terrorgeist", unit_name="Vampire Lord on Terrorgeist", unit_id=2)
@@ -355,9 +368,9 @@ class TestFindBestMatches(unittest.TestCase):
         mount_children = {"vampire_lord": [mounted]}
         results = find_best_matches(
             idx, "vampire lord on terrorgeist", "aos",
-            mount_children=mount_children,
+            mount_children=mount_children, sort=False,
         )
-        matched_keys = {r[0].unit_key for r in results}
+        matched_keys = _matched_keys(results)
         self.assertIn("vampire_lord_on_terrorgeist", matched_keys)
 
     def test_spell_injection(self):
@@ -374,9 +387,9 @@ class TestFindBestMatches(unittest.TestCase):
         results = find_best_matches(
             idx, "stormcast eternals endless spell",
             "aos",
-            spells_by_faction=spells,
+            spells_by_faction=spells, sort=False,
         )
-        matched_keys = {r[0].unit_key for r in results}
+        matched_keys = _matched_keys(results)
         self.assertIn("purple_sun", matched_keys)
 
 
@@ -0,0 +1,75 @@
+import functools
+import sys
+
+import pytest
+
+from scripts import quick_scan  # noqa: F401 - execs the canonical module under its sys.modules name
+
+# The shim copies names at import; load_tokenmap reads and rebinds the canonical module's globals
+qs = sys.modules["scripts.10_inventory.quick_scan"]
+
+# Git for Windows checks files out with CRLF line ends unless .gitattributes says otherwise
+_CRLF_TOKENMAP = (
+    b"token_map_version: 7\r\n"
+    b"\r\n"
+    b"designers:\r\n"
+    b"  acme: [\"acme\", \"acme_minis\"]\r\n"
+    b"  zed: [\"zedworks\"]\r\n"
+    b"\r\n"
+    b"factions:\r\n"
+    b"  ultra: [\"ultra_x\"]\r\n"
+    b"\r\n"
+    b"family_map:\r\n"
+    b"  elfish: [\"elfkin\"]\r\n"
+    b"\r\n"
+    b"stopwords: [\"foo\", \"bar\"]\r\n"
+)
+
+
+def _load(monkeypatch, path, use_mmap, cache_dir=None):
+    # Fresh default vocab sets per load, so both modes start from (and report against) the same state
+    for name, default in (
+        ("STOPWORDS", qs.DEFAULT_STOPWORDS),
+        ("DESIGNER_ALIASES", qs.DEFAULT_DESIGNER_ALIASES),
+        ("LINEAGE_FAMILY", qs.DEFAULT_LINEAGE_FAMILY),
+        ("FACTION_HINTS", qs.DEFAULT_FACTION_HINTS),
+    ):
+        monkeypatch.setattr(qs, name, set(default))
+    monkeypatch.setattr(qs, "VOCAB_DOMAIN", {})
+    monkeypatch.setattr(qs, "TOKENMAP_VERSION", None)
+    stats = qs.load_tokenmap(path, use_mmap=use_mmap, cache_dir=cache_dir)
+    sets = (qs.STOPWORDS, qs.DESIGNER_ALIASES, qs.LINEAGE_FAMILY, qs.FACTION_HINTS, qs.TOKENMAP_VERSION)
+    return stats, sets
+
+
+def test_crlf_tokenmap_mmap_matches_text(monkeypatch, tmp_path):
+    path = tmp_path / "tokenmap.md"
+    path.write_bytes(_CRLF_TOKENMAP)
+    text = _load(monkeypatch, path, use_mmap=False)
+    assert text[0] == {
+        "designers_added": 3, "lineage_added": 1, "faction_aliases_added": 1, "stopwords_added": 2,
+    }
+    assert _load(monkeypatch, path, use_mmap=True) == text
+
+
+
+@pytest.mark.parametrize("first_mmap", [False, True])
+def test_tokenmap_cache_is_per_parse_mode(monkeypatch, tmp_path, first_mmap):
+    # A pickle written by one parse mode must never be served to the other mode
+    path = tmp_path / "tokenmap.md"
+    path.write_bytes(_CRLF_TOKENMAP)
+    cache_dir = tmp_path / "cache"
+    first = _load(monkeypatch, path, use_mmap=first_mmap, cache_dir=cache_dir)
+
+    other = "_parse_tokenmap_text" if first_mmap else "_parse_tokenmap_mmap"
+    parser = getattr(qs, other)
+    calls = []
+
+    @functools.wraps(parser)  # keeps __name__, which is part of the cache key
+    def counting(p):
+        calls.append(p)
+        return parser(p)
+
+    monkeypatch.setattr(qs, other, counting)
+    assert _load(monkeypatch, path, use_mmap=not first_mmap, cache_dir=cache_dir) == first
+    assert calls == [path], "other parse mode was served the first mode's cache entry"
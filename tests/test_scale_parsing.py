@@ -1,52 +1,53 @@
-import importlib.util
 import unittest
 from pathlib import Path
 
 from scripts.quick_scan import SCALE_MM_RE, SCALE_RATIO_RE, classify_token, tokenize
 
+# Path with a numbered folder ('13. Medraut') that must not read as a 1:3-style ratio
+_DOTTED_DIR_PATH = Path("C:/models/Characters/13. Medraut/Female Warrior/pose1.stl")
+
 
 def _load_normalizer():
-    # Load normalize_inventory.py directly since its parent folder has a numeric prefix
-    repo_root = Path(__file__).resolve().parents[1]
-    mod_path = repo_root / 'scripts' / '30_normalize_match' / 'normalize_inventory.py'
-    spec = importlib.util.spec_from_file_location('normalize_inventory_mod', mod_path)
-    if spec is None or spec.loader is None:
-        raise RuntimeError('Failed to load normalize_inventory module spec')
-    mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mod)
-    return mod
+    # normalize_inventory.py lives under a numeric-prefix folder; the scripts.normalize_inventory
+    # facade already execs it once per process (other test modules import it too), so reuse that
+    # module via the import cache instead of loading a second copy from disk.
+    from scripts import normalize_inventory
+    return normalize_inventory
 
 
 class TestScaleParsing(unittest.TestCase):
     def test_scale_ratio_requires_separator(self):
         # Should NOT match: bare numbers or numbers with trailing dot
-        for tok in ["13", "13.", "113", "1."]:
-            self.assertIsNone(SCALE_RATIO_RE.match(tok), msg=f"Unexpected ratio match for '{tok}'")
+        no = ["13", "13.", "113", "1."]
+        unexpected = [tok for tok in no if SCALE_RATIO_RE.match(tok)]
+        self.assertEqual(unexpected, [], "Unexpected ratio matches")
 
         # Should match: explicit separators between 1 and denominator
         yes = ["1:3", "1-10", "1/35", "1_72"]
-        for tok in yes:
-            m = SCALE_RATIO_RE.match(tok)
-            self.assertIsNotNone(m, msg=f"Expected ratio match for '{tok}'")
-            den = int(m.group(1))
-            self.assertGreaterEqual(den, 1)
-            self.assertLessEqual(den, 999)
+        dens = [(tok, int(m.group(1)) if (m := SCALE_RATIO_RE.match(tok)) else None) for tok in yes]
+        self.assertEqual(dens, [(tok, int(tok[2:])) for tok in yes])
+        self.assertTrue(all(1 <= den <= 999 for _, den in dens), dens)
 
     def test_scale_mm_detection(self):
         yes = {"32mm": 32, "54mm": 54, "75mm": 75}
-        for tok, expected in yes.items():
-            m = SCALE_MM_RE.match(tok)
-            self.assertIsNotNone(m, msg=f"Expected mm match for '{tok}'")
-            self.assertEqual(int(m.group(1)), expected)
+        got = {tok: int(m.group(1)) if (m := SCALE_MM_RE.match(tok)) else None for tok in yes}
+        self.assertEqual(got, yes)
 
         no = ["mm32", "32", "32-mm", "mm"]
-        for tok in no:
-            self.assertIsNone(SCALE_MM_RE.match(tok), msg=f"Unexpected mm match for '{tok}'")
+        unexpected = [tok for tok in no if SCALE_MM_RE.match(tok)]
+        self.assertEqual(unexpected, [], "Unexpected mm matches")
+
+    def test_classify_token_scale_domains(self):
+        for tok in ["1:3", "1-10", "1/35", "1_72"]:
+            self.assertEqual(classify_token(tok), "scale_ratio", tok)
+        for tok in ["32mm", "54mm", "120mm"]:
+            self.assertEqual(classify_token(tok), "scale_mm", tok)
+        for tok in ["13", "1.", "mm32", "1-1000"]:
+            self.assertIsNone(classify_token(tok), tok)
 
     def test_tokenize_directory_with_dot_does_not_create_false_ratio(self):
         # Path like '13. Medraut' previously risked being misread; ensure no scale_ratio tokens appear
-        p = Path("C:/models/Characters/13. Medraut/Female Warrior/pose1.stl")
-        tokens = tokenize(p)
+        tokens = tokenize(_DOTTED_DIR_PATH)
         # Ensure none of the tokens classify as scale_ratio
         self.assertFalse(any(classify_token(t) == "scale_ratio" for t in tokens), tokens)
 
@@ -9,11 +9,16 @@ Tests cover:
 """
 from __future__ import annotations
 
+import functools
 import importlib.util
 import sys
 import unittest
+from dataclasses import dataclass, replace
 from pathlib import Path
 from types import SimpleNamespace
+from typing import Any, Optional, Sequence
+
+import pytest
 
 # ---------------------------------------------------------------------------
 # Load ui_display module
@@ -29,25 +34,22 @@ _FAKE_MOD_NAME = "scripts._backfill_english_tokens"
 
 
 def _identity_translate(tokens, _glos, *, dedup=True):
-    """Stub translate_tokens — returns tokens unchanged."""
-    if dedup:
-        seen = set()
-        out = []
-        for t in tokens:
-            if t not in seen:
-                seen.add(t)
-                out.append(t)
-        return out
-    return list(tokens)
-
-
-# Pre-seed the module so ui_display won't try to load the real one
-_fake_mod = SimpleNamespace(translate_tokens=_identity_translate)
-sys.modules[_FAKE_MOD_NAME] = _fake_mod  # type: ignore[assignment]
-
-spec = importlib.util.spec_from_file_location("ui_display", str(_MOD_PATH))
-ui = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(ui)
+    """Stub translate_tokens — returns tokens unchanged (order-preserving dedup when asked)."""
+    return list(dict.fromkeys(tokens)) if dedup else list(tokens)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_ui():
+    """Exec ui_display once per process (with the stub backfill module seeded) and reuse it."""
+    # Pre-seed the module so ui_display won't try to load the real one
+    sys.modules[_FAKE_MOD_NAME] = SimpleNamespace(translate_tokens=_identity_translate)  # type: ignore[assignment]
+    spec = importlib.util.spec_from_file_location("ui_display", str(_MOD_PATH))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+ui = _load_ui()
 
 # Pull out symbols
 _split_words = ui._split_words
@@ -63,143 +65,127 @@ build_ui_display = ui.build_ui_display
 # Dummy glossary (object with no entries — identity translate will ignore it)
 _GLOS = object()
 
+# Shared read-only token fixture (ui_display only iterates eng_tokens, so a tuple is fine)
+_VL_TOKENS = ("vampire", "lord", "mounted")
+
 
 # ---------------------------------------------------------------------------
 # Mock variant factory
 # ---------------------------------------------------------------------------
 
-def _variant(**kwargs) -> SimpleNamespace:
-    """Create a minimal mock variant with sensible defaults."""
-    defaults = dict(
-        rel_path="",
-        filename="",
-        character_name="",
-        codex_unit_name="",
-        english_tokens=None,
-        collection_theme="",
-        collection_original_label="",
-        collection_id=None,
-        raw_path_tokens=None,
-        files=None,
-    )
-    defaults.update(kwargs)
-    return SimpleNamespace(**defaults)
+@dataclass(slots=True, frozen=True)
+class _VariantStub:
+    """Minimal read-only stand-in for a Variant row, with sensible defaults."""
+    rel_path: str = ""
+    filename: str = ""
+    character_name: str = ""
+    codex_unit_name: str = ""
+    english_tokens: Optional[Sequence[str]] = None
+    collection_theme: str = ""
+    collection_original_label: str = ""
+    collection_id: Optional[str] = None
+    raw_path_tokens: Optional[Sequence[str]] = None
+    files: Optional[Sequence[Any]] = None
 
 
-# ── _split_words ─────────────────────────────────────────────────────────────
+_BASE_VARIANT = _VariantStub()
 
 
-class TestSplitWords(unittest.TestCase):
-    def test_camel_case(self):
-        self.assertEqual(_split_words("CamelCaseWord"), ["Camel", "Case", "Word"])
+def _variant(**kwargs) -> _VariantStub:
+    """Create a minimal mock variant, overriding only the given fields."""
+    return replace(_BASE_VARIANT, **kwargs)
 
-    def test_separator_chars(self):
-        self.assertEqual(_split_words("hello-world_foo.bar"), ["hello", "world", "foo", "bar"])
 
-    def test_number_letter_boundary(self):
-        self.assertEqual(_split_words("Item32B"), ["Item", "32", "B"])
-
-    def test_empty(self):
-        self.assertEqual(_split_words(""), [])
+# ── _split_words ─────────────────────────────────────────────────────────────
 
-    def test_path_takes_last_segment(self):
-        # paths with '/' — _split_words keeps only last segment
-        result = _split_words("foo/bar/BazQuux")
-        self.assertIn("Baz", result)
-        self.assertIn("Quux", result)
 
+@pytest.mark.parametrize("s,expected", [
+    ("CamelCaseWord", ["Camel", "Case", "Word"]),
+    ("hello-world_foo.bar", ["hello", "world", "foo", "bar"]),  # separator chars
+    ("Item32B", ["Item", "32", "B"]),  # number/letter boundary
+    ("", []),
+])
+def test_split_words(s, expected):
+    assert _split_words(s) == expected
 
-# ── _clean_words ─────────────────────────────────────────────────────────────
 
+def test_split_words_path_takes_last_segment():
+    # paths with '/' — _split_words keeps only last segment
+    result = _split_words("foo/bar/BazQuux")
+    assert "Baz" in result and "Quux" in result
 
-class TestCleanWords(unittest.TestCase):
-    def test_removes_banned_words(self):
-        result = _clean_words(["supported", "knight", "stl"])
-        self.assertNotIn("supported", result)
-        self.assertNotIn("stl", result)
-        self.assertIn("knight", result)
 
-    def test_removes_pure_digits(self):
-        result = _clean_words(["32", "knight"])
-        self.assertNotIn("32", result)
+# ── _clean_words ─────────────────────────────────────────────────────────────
 
-    def test_removes_mm_measurements(self):
-        result = _clean_words(["32mm", "model"])
-        self.assertNotIn("32mm", result)
 
-    def test_removes_very_short_tokens(self):
-        # single-char tokens (except allowed short words) are stripped
-        result = _clean_words(["x", "a", "of", "knight"])
-        self.assertNotIn("x", result)
-        self.assertNotIn("a", result)
-        self.assertIn("of", result)
+@pytest.mark.parametrize("words,dropped,kept", [
+    (["supported", "knight", "stl"], {"supported", "stl"}, {"knight"}),  # banned words
+    (["32", "knight"], {"32"}, {"knight"}),  # pure digits
+    (["32mm", "model"], {"32mm"}, set()),  # mm measurements
+    # single-char tokens (except allowed short words) are stripped
+    (["x", "a", "of", "knight"], {"x", "a"}, {"of", "knight"}),
+])
+def test_clean_words(words, dropped, kept):
+    result = set(_clean_words(words))
+    assert not (result & dropped)
+    assert kept <= result
 
 
 # ── _title_case ──────────────────────────────────────────────────────────────
 
 
-class TestTitleCase(unittest.TestCase):
-    def test_basic(self):
-        self.assertEqual(_title_case(["blood", "angels"]), "Blood Angels")
+@pytest.mark.parametrize("words,expected", [
+    (["blood", "angels"], "Blood Angels"),
+    (["of", "the", "realm"], "Of the Realm"),  # small words lowered except first
+    ([], ""),
+])
+def test_title_case(words, expected):
+    assert _title_case(words) == expected
 
-    def test_small_words_lowered_except_first(self):
-        self.assertEqual(_title_case(["of", "the", "realm"]), "Of the Realm")
 
-    def test_acronyms_uppercased(self):
-        self.assertIn("CG", _title_case(["cg", "model"]))
-
-    def test_empty(self):
-        self.assertEqual(_title_case([]), "")
+def test_title_case_acronyms_uppercased():
+    assert "CG" in _title_case(["cg", "model"])
 
 
 # ── _norm_label ──────────────────────────────────────────────────────────────
 
 
-class TestNormLabel(unittest.TestCase):
-    def test_lowered_and_cleaned(self):
-        result = _norm_label("Blood Angels - Captain")
-        self.assertEqual(result, "blood angels captain")
-
-    def test_empty(self):
-        self.assertEqual(_norm_label(""), "")
-        self.assertEqual(_norm_label(None), "")
+@pytest.mark.parametrize("s,expected", [
+    ("Blood Angels - Captain", "blood angels captain"),
+    ("", ""),
+    (None, ""),
+])
+def test_norm_label(s, expected):
+    assert _norm_label(s) == expected
 
 
 # ── _is_bucket_phrase ────────────────────────────────────────────────────────
 
 
-class TestIsBucketPhrase(unittest.TestCase):
-    def test_generic_body_parts(self):
-        self.assertTrue(_is_bucket_phrase(["heads", "and", "arms"]))
-        self.assertTrue(_is_bucket_phrase(["bodies"]))
-
-    def test_non_generic(self):
-        self.assertFalse(_is_bucket_phrase(["vampire", "lord"]))
-
-    def test_all_connectors_no_nouns(self):
-        self.assertFalse(_is_bucket_phrase(["and"]))
+@pytest.mark.parametrize("words,expected", [
+    (["heads", "and", "arms"], True),  # generic body parts
+    (["bodies"], True),
+    (["vampire", "lord"], False),
+    (["and"], False),  # all connectors, no nouns
+])
+def test_is_bucket_phrase(words, expected):
+    assert _is_bucket_phrase(words) is expected
 
 
 # ── _is_packaging_segment ───────────────────────────────────────────────────
 
 
-class TestIsPackagingSegment(unittest.TestCase):
-    def test_supported(self):
-        self.assertTrue(_is_packaging_segment("supported"))
-        self.assertTrue(_is_packaging_segment("Unsupported"))
-
-    def test_packaging_formats(self):
-        self.assertTrue(_is_packaging_segment("stl"))
-        self.assertTrue(_is_packaging_segment("lychee"))
-
-    def test_mm_measurements(self):
-        self.assertTrue(_is_packaging_segment("32mm"))
-
-    def test_non_packaging(self):
-        self.assertFalse(_is_packaging_segment("Vampire Lord"))
-
-    def test_empty(self):
-        self.assertFalse(_is_packaging_segment(""))
+@pytest.mark.parametrize("seg,expected", [
+    ("supported", True),
+    ("Unsupported", True),
+    ("stl", True),  # packaging formats
+    ("lychee", True),
+    ("32mm", True),  # mm measurements
+    ("Vampire Lord", False),
+    ("", False),
+])
+def test_is_packaging_segment(seg, expected):
+    assert _is_packaging_segment(seg) is expected
 
 
 # ── _best_named_segment_from_path ────────────────────────────────────────────
@@ -247,9 +233,8 @@ class TestChooseThingName(unittest.TestCase):
         self.assertIn("Intercessor", result)
 
     def test_english_tokens_fallback(self):
-        v = _variant(english_tokens=["vampire", "lord", "mounted"])
-        result = _choose_thing_name(v, _GLOS, ["vampire", "lord", "mounted"],
-                                    _translate=_identity_translate)
+        v = _variant(english_tokens=_VL_TOKENS)
+        result = _choose_thing_name(v, _GLOS, _VL_TOKENS, _translate=_identity_translate)
         # Should produce something from tokens
         self.assertTrue(len(result) > 0)
 
@@ -313,7 +298,3 @@ class TestBuildUiDisplay(unittest.TestCase):
         result = build_ui_display(v, _GLOS)
         # The bucket 'Bodies' should get a unit prefix
         self.assertTrue(len(result) > 0)
-
-
-if __name__ == "__main__":
-    unittest.main()
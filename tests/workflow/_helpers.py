@@ -0,0 +1,31 @@
+"""Assertion helpers shared by the workflow test modules.
+
+tests/workflow is not a package; pytest puts this directory on sys.path for its test
+modules, so they import these as ``from _helpers import ...``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Any
+
+
+def assert_ok(cp: subprocess.CompletedProcess, context: str = "") -> None:
+    """Fail with the command's exit code and captured output unless it exited 0."""
+    if cp.returncode != 0:
+        raise AssertionError(
+            f"{context or 'command'} failed: rc={cp.returncode}\nSTDOUT:\n{cp.stdout}\nSTDERR:\n{cp.stderr}"
+        )
+
+
+def read_json(path: Path, what: str = "report") -> Any:
+    """Parse a JSON report the command under test must have written (non-empty)."""
+    # One stat covers both "was it written" and "is it non-empty"
+    try:
+        size = os.stat(path).st_size
+    except FileNotFoundError:
+        raise AssertionError(f"Expected {what} to be written: {path}") from None
+    assert size > 0, f"Expected {what} to be non-empty: {path}"
+    return json.loads(path.read_bytes())
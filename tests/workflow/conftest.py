@@ -1,38 +1,62 @@
 from __future__ import annotations
 
+import contextlib
+import fnmatch
+import functools
+import glob
+import io
 import os
+import runpy
+import shutil
 import subprocess
 import sys
-import time
+import tempfile
+import traceback
+import uuid
+from collections.abc import Iterator
 from pathlib import Path
+from typing import IO, TYPE_CHECKING
 
 import pytest
 
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+try:
+    import db.session as _dbs  # type: ignore
+except Exception:  # pragma: no cover - workflow tests then fail on their own CLI steps
+    _dbs = None
+
 # Avoid collecting the legacy module name that clashes with top-level placeholder
 collect_ignore = [
     "test_multilingual_backfill.py",
 ]
 
 
-@pytest.fixture(scope="session")
-def repo_root() -> Path:
-    # tests/workflow/ -> tests -> repo_root
-    return Path(__file__).resolve().parents[2]
+# repo_root comes from tests/conftest.py (one Path.resolve() for the whole run)
 
 
 @pytest.fixture(scope="session")
 def venv_python(repo_root: Path) -> str:
+    return _find_venv_python(repo_root)
+
+
+@functools.cache
+def _find_venv_python(repo_root: Path) -> str:
     # Prefer Windows path; fall back to POSIX for portability
-    win_path = repo_root / ".venv" / "Scripts" / "python.exe"
-    posix_path = repo_root / ".venv" / "bin" / "python"
-    if win_path.exists():
-        return str(win_path)
-    if posix_path.exists():
-        return str(posix_path)
+    for candidate in (repo_root / ".venv" / "Scripts" / "python.exe", repo_root / ".venv" / "bin" / "python"):
+        if candidate.exists():
+            return str(candidate)
     # As a last resort, use sys.executable (developer's interpreter)
     return sys.executable
 
 
+def _sqlite_url(db_file: Path) -> str:
+    # Absolute sqlite URL, so every process resolves the same file whatever its cwd.
+    # tmp_dir hangs off the already-resolved repo root, so no further resolve() is needed.
+    return f"sqlite:///{db_file.as_posix()}"
+
+
 @pytest.fixture(scope="session")
 def tmp_dir(repo_root: Path) -> Path:
     d = repo_root / ".pytest-tmp"
@@ -40,79 +64,295 @@ def tmp_dir(repo_root: Path) -> Path:
     return d
 
 
+@pytest.fixture(scope="session")
+def _tmp_db_files() -> Iterator[list[Path]]:
+    # Per-test DB files are removed once at session end rather than before each test
+    files: list[Path] = []
+    yield files
+    if _dbs is not None:
+        # Point the in-process engine away from the last test DB so its file handle is dropped
+        _dbs.reconfigure('sqlite:///:memory:')
+    for f in files:
+        try:
+            f.unlink(missing_ok=True)
+        except PermissionError:
+            # Windows: a straggling handle keeps the file; it is uniquely named, so harmless
+            pass
+
+
 @pytest.fixture(scope="function")
-def tmp_db_url(tmp_dir: Path, repo_root: Path) -> str:
-    db_file = tmp_dir / "stl_manager_e2e.db"
-    # Ensure a clean slate for each test function that uses this fixture
-    if db_file.exists():
-        # On Windows a previous engine may briefly hold a handle; retry unlink
-        for attempt in range(10):
-            try:
-                db_file.unlink()
-                break
-            except (PermissionError, FileNotFoundError):
-                # Try to force-close any session engine still pointing at this file
-                try:
-                    import db.session as _dbs  # type: ignore
-                    # Switch to in-memory to drop file handle, then dispose
-                    if hasattr(_dbs, 'reconfigure'):
-                        _dbs.reconfigure('sqlite:///:memory:')
-                    else:
-                        try:
-                            _dbs.engine.dispose()  # type: ignore[attr-defined]
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-                time.sleep(0.1)
-        else:
-            # As a last resort, rename to a temp unique name to avoid clashes
-            try:
-                tmp_name = db_file.with_name(db_file.stem + f"_{int(time.time()*1000)}" + db_file.suffix)
-                db_file.rename(tmp_name)
-            except Exception:
-                pass
-    # Build an absolute sqlite URL to avoid relative path ambiguity across processes
-    abs_path = (repo_root / ".pytest-tmp" / db_file.name).resolve()
-    url = f"sqlite:///{abs_path.as_posix()}"
+def tmp_db_url(tmp_dir: Path, _tmp_db_files: list[Path]) -> str:
+    # A fresh, uniquely named file per test: nothing to unlink (or wait on Windows locks) up front
+    db_file = tmp_dir / f"stl_e2e_{uuid.uuid4().hex}.db"
+    _tmp_db_files.append(db_file)
+    url = _sqlite_url(db_file)
     # Also proactively bind the session engine to this DB for this test process
-    try:
-        import db.session as _dbs  # type: ignore
-        if hasattr(_dbs, 'reconfigure'):
-            _dbs.reconfigure(url)
-        # Ensure child processes inherit the absolute URL
-        os.environ["STLMGR_DB_URL"] = url
-    except Exception:
-        pass
+    if _dbs is not None:
+        _dbs.reconfigure(url)
+    # Ensure child processes inherit the absolute URL
+    os.environ["STLMGR_DB_URL"] = url
     return url
 
 
-def run_cli(args: list[str], cwd: Path, env: dict | None = None) -> subprocess.CompletedProcess:
-    # Execute a command without invoking a shell to avoid quoting issues
-    merged_env = dict(os.environ)
-    # Ensure Python can import modules from the repo root (db/, scripts/, etc.)
-    py_path = merged_env.get("PYTHONPATH", "")
-    sep = ";" if os.name == "nt" else ":"
-    if str(cwd) not in (py_path.split(sep) if py_path else []):
-        merged_env["PYTHONPATH"] = (py_path + (sep if py_path else "") + str(cwd))
+@pytest.fixture(scope="function")
+def db_session(tmp_db_url: str) -> Iterator[Session]:
+    """A Session on a private engine bound to tmp_db_url, for in-test seeding and checks.
+
+    Independent of db.session's module-level engine and of STLMGR_DB_URL, so test code
+    never has to mutate os.environ to reach its own DB.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    engine = create_engine(tmp_db_url, future=True)
+    try:
+        with sessionmaker(engine, expire_on_commit=False)() as sess:
+            yield sess
+    finally:
+        # Release the pooled connection so the DB file can be removed at session end
+        engine.dispose()
+
+
+def _template_path(tmp_dir: Path, stem: str) -> Path:
+    # One template per xdist worker (PYTEST_XDIST_WORKER is unset without xdist)
+    template = tmp_dir / f"{stem}{os.environ.get('PYTEST_XDIST_WORKER', '')}.db"
+    template.unlink(missing_ok=True)
+    return template
+
+
+def _run_setup_steps(steps: list[list[str]], url: str, repo_root: Path, base_env: dict[str, str]) -> None:
+    for argv in steps:
+        cp = run_cli(argv, repo_root, env={"STLMGR_DB_URL": url}, base_env=base_env)
+        if cp.returncode != 0:
+            raise RuntimeError(f"seeding {argv[1]} failed: rc={cp.returncode}\nSTDOUT:\n{cp.stdout}\nSTDERR:\n{cp.stderr}")
+
+
+@pytest.fixture(scope="session")
+def schema_db_template(tmp_dir: Path, repo_root: Path, venv_python: str, base_env: dict[str, str]) -> Path:
+    """Run bootstrap_db.py --use-metadata once per session into an empty template DB."""
+    template = _template_path(tmp_dir, "schema_template")
+    url = _sqlite_url(template)
+    _run_setup_steps(
+        [[venv_python, "scripts/00_bootstrap/bootstrap_db.py", "--db-url", url, "--use-metadata"]],
+        url, repo_root, base_env,
+    )
+    return template
+
+
+@pytest.fixture(scope="session")
+def seeded_db_template(
+    tmp_dir: Path, repo_root: Path, venv_python: str, base_env: dict[str, str], schema_db_template: Path,
+) -> Path:
+    """Schema template plus the sample inventory (load_sample.py), built once per session.
+
+    Tests that only need "schema + sample data" copy this file instead of re-running
+    bootstrap_db.py and load_sample.py (two interpreter starts each) themselves.
+    """
+    template = _template_path(tmp_dir, "seed_template")
+    shutil.copyfile(schema_db_template, template)
+    url = _sqlite_url(template)
+    inv = tmp_dir / "sample_inventory.json"
+    steps = []
+    if not inv.exists():
+        steps.append([venv_python, "scripts/10_inventory/create_sample_inventory.py", "--out", str(inv)])
+    steps.append([venv_python, "scripts/20_loaders/load_sample.py", "--file", str(inv)])
+    _run_setup_steps(steps, url, repo_root, base_env)
+    return template
+
+
+# Vocab loader runs for loaded_db_template (test_load_vocabs runs the same loaders on a fresh DB)
+_VOCAB_LOAD_STEPS: tuple[tuple[str, ...], ...] = (
+    # load_designers expects a positional path and --commit (no --db-url)
+    ("scripts/20_loaders/load_designers.py", "vocab/designers_tokenmap.md", "--commit"),
+    # load_franchises expects a directory path and --commit
+    ("scripts/20_loaders/load_franchises.py", "vocab/franchises", "--commit"),
+    # 40K/AoS/Heresy codex manifests plus 40K parts vocab (wargear and bodies) in one loader
+    # run; each --file still gets its own session and commit
+    (
+        "scripts/20_loaders/load_codex_from_yaml.py",
+        "--file", "vocab/codex_units_w40k.yaml",
+        "--file", "vocab/codex_units_aos.yaml",
+        "--file", "vocab/codex_units_horus_heresy.yaml",
+        "--file", "vocab/wargear_w40k.yaml",
+        "--file", "vocab/bodies_w40k.yaml",
+        "--commit",
+    ),
+)
+
+
+@pytest.fixture(scope="session")
+def loaded_db_template(
+    tmp_dir: Path, repo_root: Path, venv_python: str, base_env: dict[str, str], schema_db_template: Path,
+) -> Path:
+    """Schema template plus designers, franchises and codex/parts vocab, built once per session.
+
+    Matcher tests copy this file instead of re-running the loaders in their own bodies.
+    """
+    template = _template_path(tmp_dir, "loaded_template")
+    shutil.copyfile(schema_db_template, template)
+    url = _sqlite_url(template)
+    _run_setup_steps([[venv_python, *step] for step in _VOCAB_LOAD_STEPS], url, repo_root, base_env)
+    return template
+
+
+@pytest.fixture(scope="function")
+def bootstrapped_db_url(tmp_db_url: str, schema_db_template: Path) -> str:
+    """Like tmp_db_url, but the DB file starts as a copy of the empty-schema session template."""
+    shutil.copyfile(schema_db_template, tmp_db_url.removeprefix("sqlite:///"))
+    return tmp_db_url
+
+
+@pytest.fixture(scope="function")
+def seeded_db_url(tmp_db_url: str, seeded_db_template: Path) -> str:
+    """Like tmp_db_url, but the DB file starts as a copy of the seeded session template."""
+    shutil.copyfile(seeded_db_template, tmp_db_url.removeprefix("sqlite:///"))
+    return tmp_db_url
+
+
+@pytest.fixture(scope="function")
+def loaded_db_url(tmp_db_url: str, loaded_db_template: Path) -> str:
+    """Like tmp_db_url, but the DB file starts as a copy of the vocab-loaded session template."""
+    shutil.copyfile(loaded_db_template, tmp_db_url.removeprefix("sqlite:///"))
+    return tmp_db_url
+
+
+@functools.cache
+def _python_path_with(py_path: str, root: str) -> str:
+    # Keyed on the current PYTHONPATH, so the split/join happens once per distinct value
+    if root in (py_path.split(os.pathsep) if py_path else []):
+        return py_path
+    return py_path + (os.pathsep if py_path else "") + root
+
+
+@pytest.fixture(scope="session")
+def base_env(repo_root: Path) -> dict[str, str]:
+    """os.environ snapshot for CLI runs with the repo root on PYTHONPATH (treat as read-only)."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = _python_path_with(env.get("PYTHONPATH", ""), str(repo_root))
+    # tmp_db_url re-points STLMGR_DB_URL per test, so run_cli reads that one variable live
+    env.pop("STLMGR_DB_URL", None)
+    return env
+
+
+def run_cli(
+    args: list[str], cwd: Path, env: dict | None = None, capture: bool = True,
+    base_env: dict[str, str] | None = None,
+) -> subprocess.CompletedProcess:
+    # Execute a command without invoking a shell to avoid quoting issues.
+    # capture=False spools stdout to an unlinked temp file instead of a pipe and only reads it
+    # back when the command fails (cp.stdout is None on success); stderr is always kept.
+    if base_env is None:
+        merged_env = dict(os.environ)
+        # Ensure Python can import modules from the repo root (db/, scripts/, etc.)
+        merged_env["PYTHONPATH"] = _python_path_with(merged_env.get("PYTHONPATH", ""), str(cwd))
+    else:
+        merged_env = {**base_env}
+        db_url = os.environ.get("STLMGR_DB_URL")
+        if db_url:
+            merged_env["STLMGR_DB_URL"] = db_url
     if env:
         merged_env.update(env)
+    if not capture:
+        with tempfile.TemporaryFile() as out:
+            cp = subprocess.run(args, cwd=str(cwd), stdout=out, stderr=subprocess.PIPE, text=True, env=merged_env)
+            cp.stdout = _failure_output(out, cp.returncode)
+        return cp
     return subprocess.run(args, cwd=str(cwd), capture_output=True, text=True, env=merged_env)
 
 
-@pytest.fixture
-def cli(repo_root: Path):
-    def _runner(argv: list[str], env: dict | None = None):
-        return run_cli(argv, repo_root, env=env)
-    return _runner
+def _failure_output(spool: IO, rc: int) -> str | None:
+    # Slurp a capture=False stdout spool only when the caller will need it for the failure message
+    if rc == 0:
+        return None
+    spool.seek(0)
+    data = spool.read()
+    return data.decode("utf-8", "replace") if isinstance(data, bytes) else data
+
+
+# Scripts whose CLI behaves the same when exec'd inside the test process: they read the DB via
+# db.session.get_session() (which follows STLMGR_DB_URL per call) and keep no import-time state
+# that would leak between runs. Everything else still gets a fresh interpreter.
+_INPROC_SAFE_SCRIPTS = frozenset({
+    "scripts/10_inventory/compute_hashes.py",
+    "scripts/30_normalize_match/apply_proposals_from_report.py",
+    "scripts/30_normalize_match/match_franchise_characters.py",
+    "scripts/30_normalize_match/match_variants_to_units.py",
+    "scripts/30_normalize_match/normalize_inventory.py",
+    "scripts/40_kits/backfill_kits.py",
+    "scripts/50_cleanup_repair/prune_invalid_variants.py",
+    "scripts/50_cleanup_repair/repair_orphan_variants.py",
+    "scripts/60_reports_analysis/verify_applied_matches.py",
+})
+
+
+def run_cli_inproc(
+    script_rel: str, args: list[str], cwd: Path, env: dict | None = None, capture: bool = True,
+) -> subprocess.CompletedProcess:
+    """Run a repo script as __main__ in this process, mimicking run_cli's CompletedProcess result.
+
+    argv, environment, cwd and sys.path are patched for the call and restored afterwards;
+    stdout/stderr are captured as text (with capture=False stdout is spooled to a temp file and
+    only returned on failure, as in run_cli) and SystemExit is mapped to a return code.
+    """
+    script = cwd / script_rel
+    out = io.StringIO() if capture else tempfile.TemporaryFile("w+", encoding="utf-8")  # noqa: SIM115 - closed below
+    err = io.StringIO()
+    saved_argv, saved_path, saved_env = sys.argv[:], sys.path[:], dict(os.environ)
+    rc = 0
+    try:
+        sys.argv = [str(script), *args]
+        # Mirror `python script.py` with PYTHONPATH=<repo>: script dir first, then repo root
+        sys.path[:0] = [str(script.parent), str(cwd)]
+        if env:
+            os.environ.update(env)
+        with contextlib.chdir(cwd), contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                runpy.run_path(str(script), run_name="__main__")
+            except SystemExit as e:
+                if isinstance(e.code, int):
+                    rc = e.code
+                elif e.code is not None:
+                    print(e.code, file=sys.stderr)
+                    rc = 1
+            except Exception:
+                traceback.print_exc()
+                rc = 1
+        stdout = out.getvalue() if capture else _failure_output(out, rc)
+    finally:
+        sys.argv, sys.path[:] = saved_argv, saved_path
+        os.environ.clear()
+        os.environ.update(saved_env)
+        if not capture:
+            out.close()
+    return subprocess.CompletedProcess([sys.executable, script_rel, *args], rc, stdout, err.getvalue())
 
 
-def ensure_reports_dir(repo_root: Path, sub: str = "test_artifacts") -> Path:
-    r = repo_root / "reports" / sub
-    r.mkdir(parents=True, exist_ok=True)
-    return r
+@pytest.fixture
+def cli(repo_root: Path, venv_python: str, base_env: dict[str, str]):
+    # STLMGR_FORCE_SUBPROC=1 sends every step through a real subprocess (e.g. to debug isolation issues)
+    inproc = os.environ.get("STLMGR_FORCE_SUBPROC", "0") not in ("1", "true", "True")
+
+    def _runner(argv: list[str], env: dict | None = None, capture: bool = True):
+        # `script --help` only builds the argparse parser and exits, so any script qualifies
+        if inproc and len(argv) >= 2 and argv[0] == venv_python and (
+            argv[1] in _INPROC_SAFE_SCRIPTS or argv[2:] == ["--help"]
+        ):
+            return run_cli_inproc(argv[1], argv[2:], repo_root, env=env, capture=capture)
+        return run_cli(argv, repo_root, env=env, capture=capture, base_env=base_env)
+    return _runner
 
 
 def latest_report(glob_pattern: str, repo_root: Path) -> Path | None:
-    matches = sorted(repo_root.glob(glob_pattern))
-    return matches[-1] if matches else None
+    sub, _, name_pattern = glob_pattern.rpartition("/")
+    if glob.has_magic(sub):
+        # Wildcards in the directory part need a real (possibly recursive) glob
+        matches = sorted(repo_root.glob(glob_pattern))
+        return matches[-1] if matches else None
+    # Report patterns name a single directory: list just that one instead of walking the tree
+    d = repo_root / sub
+    try:
+        with os.scandir(d) as it:
+            names = sorted(e.name for e in it if fnmatch.fnmatchcase(e.name, name_pattern))
+    except FileNotFoundError:
+        return None
+    return d / names[-1] if names else None
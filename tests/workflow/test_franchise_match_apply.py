@@ -4,44 +4,22 @@ import json
 from pathlib import Path
 
 import pytest
+from _helpers import assert_ok
 
-pytestmark = pytest.mark.workflow
-
-
-def _assert_ok(rc, cp, context: str = ""):
-    if rc != 0:
-        raise AssertionError(f"{context} failed: rc={rc}\nSTDOUT:\n{cp.stdout}\nSTDERR:\n{cp.stderr}")
+# Own xdist group so it runs beside the kits-backfill group under --dist=loadgroup
+pytestmark = [pytest.mark.workflow, pytest.mark.xdist_group("workflow_franchise")]
 
 
 def _maybe_read_json(p: Path):
     try:
-        return json.loads(p.read_text("utf-8"))
+        return json.loads(p.read_bytes())
     except Exception:
         return None
 
 
-def test_franchise_match_then_apply(cli, venv_python: str, tmp_db_url: str, repo_root: Path):
-    # Ensure DB exists (bootstrap)
-    cp = cli([venv_python, "scripts/00_bootstrap/bootstrap_db.py", "--db-url", tmp_db_url, "--use-metadata"])
-    _assert_ok(cp.returncode, cp, "bootstrap_db")
-
-    # Minimum preconditions: sample inventory present
-    inv = repo_root / ".pytest-tmp" / "sample_inventory.json"
-    if not inv.exists():
-        cp = cli([venv_python, "scripts/10_inventory/create_sample_inventory.py", "--out", str(inv)])
-        _assert_ok(cp.returncode, cp, "create_sample_inventory")
-    cp = cli([
-        venv_python,
-        "scripts/20_loaders/load_sample.py",
-        "--file",
-        str(inv),
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "load_sample --apply")
-
+def test_franchise_match_then_apply(cli, venv_python: str, seeded_db_url: str, tmp_path: Path):
     # Dry-run matcher
-    reports_dir = repo_root / "reports" / "test_artifacts"
-    reports_dir.mkdir(parents=True, exist_ok=True)
-    out_path = reports_dir / "match_franchise_test.json"
+    out_path = tmp_path / "match_franchise_test.json"
     cp = cli([
         venv_python,
         "scripts/30_normalize_match/match_franchise_characters.py",
@@ -49,8 +27,8 @@ def test_franchise_match_then_apply(cli, venv_python: str, tmp_db_url: str, repo
         "100",
         "--out",
         str(out_path),
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "match_franchise_characters --out")
+    ], env={"STLMGR_DB_URL": seeded_db_url}, capture=False)
+    assert_ok(cp, "match_franchise_characters --out")
     assert out_path.exists(), "Expected franchise matcher report"
     data = _maybe_read_json(out_path)
     # Schema sanity: either dict with proposals or empty list OK
@@ -63,8 +41,8 @@ def test_franchise_match_then_apply(cli, venv_python: str, tmp_db_url: str, repo
         "scripts/30_normalize_match/apply_proposals_from_report.py",
         "--report",
         str(out_path),
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "apply_proposals_from_report")
+    ], env={"STLMGR_DB_URL": seeded_db_url}, capture=False)
+    assert_ok(cp, "apply_proposals_from_report")
 
     # Optional: compute hashes dry-run on a small limit to ensure script runs
     cp = cli([
@@ -72,14 +50,14 @@ def test_franchise_match_then_apply(cli, venv_python: str, tmp_db_url: str, repo
         "scripts/10_inventory/compute_hashes.py",
         "--limit",
         "5",
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "compute_hashes --limit 5")
+    ], env={"STLMGR_DB_URL": seeded_db_url}, capture=False)
+    assert_ok(cp, "compute_hashes --limit 5")
 
     # Verify applied matches using the same report
     cp = cli([
         venv_python,
         "scripts/60_reports_analysis/verify_applied_matches.py",
-        "--db-url", tmp_db_url,
+        "--db-url", seeded_db_url,
         "--file", str(out_path),
-    ])
-    _assert_ok(cp.returncode, cp, "verify_applied_matches (franchise)")
+    ], capture=False)
+    assert_ok(cp, "verify_applied_matches (franchise)")
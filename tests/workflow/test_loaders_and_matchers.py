@@ -3,29 +3,24 @@ from __future__ import annotations
 from pathlib import Path
 
 import pytest
+from _helpers import assert_ok, read_json
+from sqlalchemy import select
 
-pytestmark = pytest.mark.workflow
+# Own xdist group: both tests build on the schema/vocab templates, so keep them on one worker
+pytestmark = [pytest.mark.workflow, pytest.mark.xdist_group("workflow_vocab")]
 
 
-def _assert_ok(rc, cp, context: str = ""):
-    if rc != 0:
-        raise AssertionError(f"{context} failed: rc={rc}\nSTDOUT:\n{cp.stdout}\nSTDERR:\n{cp.stderr}")
-
-
-def test_load_vocabs_and_match_units(cli, venv_python: str, tmp_db_url: str, repo_root: Path):
-    # Ensure DB exists (bootstrap)
-    cp = cli([venv_python, "scripts/00_bootstrap/bootstrap_db.py", "--db-url", tmp_db_url, "--use-metadata"])
-    _assert_ok(cp.returncode, cp, "bootstrap_db")
-
-    # Load minimal vocab sets
+def test_load_vocabs(cli, venv_python: str, bootstrapped_db_url: str):
+    # bootstrapped_db_url: copy of the session's bootstrap_db.py --use-metadata template
+    # Load minimal vocab sets into a fresh DB; matcher tests use the preloaded loaded_db_url instead
     # load_designers expects a positional path and --commit (no --db-url)
     cp = cli([
         venv_python,
         "scripts/20_loaders/load_designers.py",
         "vocab/designers_tokenmap.md",
         "--commit",
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "load_designers --commit")
+    ], env={"STLMGR_DB_URL": bootstrapped_db_url}, capture=False)
+    assert_ok(cp, "load_designers --commit")
 
     # load_franchises expects a directory path and --commit
     cp = cli([
@@ -33,61 +28,28 @@ def test_load_vocabs_and_match_units(cli, venv_python: str, tmp_db_url: str, rep
         "scripts/20_loaders/load_franchises.py",
         "vocab/franchises",
         "--commit",
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "load_franchises --commit")
-
-    # Load at least one codex file (40K) to allow unit matcher to execute sanely
-    cp = cli([
-        venv_python,
-        "scripts/20_loaders/load_codex_from_yaml.py",
-        "--file",
-        "vocab/codex_units_w40k.yaml",
-        "--commit",
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "load_codex_from_yaml (40K)")
+    ], env={"STLMGR_DB_URL": bootstrapped_db_url}, capture=False)
+    assert_ok(cp, "load_franchises --commit")
 
-    # Also load AoS and Heresy codex manifests (commit)
+    # Load the 40K/AoS/Heresy codex manifests plus 40K parts vocab (wargear and bodies) in one
+    # loader run; each --file still gets its own session and commit
     cp = cli([
         venv_python,
         "scripts/20_loaders/load_codex_from_yaml.py",
-        "--file",
-        "vocab/codex_units_aos.yaml",
+        "--file", "vocab/codex_units_w40k.yaml",
+        "--file", "vocab/codex_units_aos.yaml",
+        "--file", "vocab/codex_units_horus_heresy.yaml",
+        "--file", "vocab/wargear_w40k.yaml",
+        "--file", "vocab/bodies_w40k.yaml",
         "--commit",
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "load_codex_from_yaml (AoS)")
+    ], env={"STLMGR_DB_URL": bootstrapped_db_url}, capture=False)
+    assert_ok(cp, "load_codex_from_yaml (40K, AoS, Heresy, wargear_w40k, bodies_w40k)")
 
-    cp = cli([
-        venv_python,
-        "scripts/20_loaders/load_codex_from_yaml.py",
-        "--file",
-        "vocab/codex_units_horus_heresy.yaml",
-        "--commit",
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "load_codex_from_yaml (Heresy)")
-
-    # Load parts vocab for 40K (wargear and bodies)
-    cp = cli([
-        venv_python,
-        "scripts/20_loaders/load_codex_from_yaml.py",
-        "--file",
-        "vocab/wargear_w40k.yaml",
-        "--commit",
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "load_codex_from_yaml (wargear_w40k)")
-
-    cp = cli([
-        venv_python,
-        "scripts/20_loaders/load_codex_from_yaml.py",
-        "--file",
-        "vocab/bodies_w40k.yaml",
-        "--commit",
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "load_codex_from_yaml (bodies_w40k)")
 
+def test_match_units_apply_and_verify(cli, venv_python: str, loaded_db_url: str, db_session, tmp_path: Path):
+    # loaded_db_url: copy of the session template with designers, franchises and codex vocab loaded
     # Run unit matcher dry-run with children; just verify it runs and writes a report
-    reports_dir = repo_root / "reports" / "test_artifacts"
-    reports_dir.mkdir(parents=True, exist_ok=True)
-    out_path = reports_dir / "match_units_with_children_test.json"
+    out_path = tmp_path / "match_units_with_children_test.json"
     cp = cli([
         venv_python,
         "scripts/30_normalize_match/match_variants_to_units.py",
@@ -96,12 +58,10 @@ def test_load_vocabs_and_match_units(cli, venv_python: str, tmp_db_url: str, rep
         "50",
         "--out",
         str(out_path),
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "match_variants_to_units --out")
-    assert out_path.exists(), "Expected unit matcher report to be written"
+    ], env={"STLMGR_DB_URL": loaded_db_url}, capture=False)
+    assert_ok(cp, "match_variants_to_units --out")
     # Schema sanity: ensure proposals list exists
-    import json
-    data = json.loads(out_path.read_text("utf-8"))
+    data = read_json(out_path, "unit matcher report")
     assert isinstance(data, dict) and "proposals" in data and isinstance(data["proposals"], list)
 
     # Apply unit matches (if any) by re-running with --apply and a small limit, then idempotency check
@@ -115,17 +75,19 @@ def test_load_vocabs_and_match_units(cli, venv_python: str, tmp_db_url: str, rep
         "--out",
         str(out_path),
         "--append-timestamp",
-    ], env={"STLMGR_DB_URL": tmp_db_url})
-    _assert_ok(cp.returncode, cp, "match_variants_to_units --apply")
-
-    # Verify applied matches utility runs against the last proposals JSON if present
-    # (we don't depend on exact contents; just ensure it executes)
-    latest = out_path if out_path.exists() else None
-    if latest:
-        cp = cli([
-            venv_python,
-            "scripts/60_reports_analysis/verify_applied_matches.py",
-            "--db-url", tmp_db_url,
-            "--file", str(latest),
-        ])
-        _assert_ok(cp.returncode, cp, "verify_applied_matches")
+    ], env={"STLMGR_DB_URL": loaded_db_url}, capture=False)
+    assert_ok(cp, "match_variants_to_units --apply")
+
+    # Verify what --apply wrote directly in the DB (verify_applied_matches.py's CLI is covered by
+    # the franchise workflow): proposed variants exist and unit links have no dangling ends
+    from db.models import Unit, Variant, VariantUnitLink
+    proposed = {p["variant_id"] for p in data["proposals"] if "variant_id" in p}
+    known = set(db_session.scalars(select(Variant.id).where(Variant.id.in_(proposed))))
+    assert proposed <= known, f"Proposed variants missing from DB: {sorted(proposed - known)[:10]}"
+    dangling = db_session.execute(
+        select(VariantUnitLink.id)
+        .outerjoin(Variant, Variant.id == VariantUnitLink.variant_id)
+        .outerjoin(Unit, Unit.id == VariantUnitLink.unit_id)
+        .where((Variant.id.is_(None)) | (Unit.id.is_(None)))
+    ).scalars().all()
+    assert dangling == [], f"variant_unit_link rows with missing variant/unit: {dangling[:10]}"